@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+anomaly_guard.py — Compare an extraction against the previous run before publishing it.
+
+A bad scrape day (a crawler that fell over, a half-loaded table) shows up as
+job counts that collapse across the board, or for a handful of tools. Each
+run's per-tool metrics are lined up by slug with the previous run's:
+    job_count     tools.json job_count
+    co_mentions   sum of the tool's pair counts in cooccurrence.json
+    salary_p50    median salary in salaries.json
+and each metric is compared as one column of log ratios r = log(current /
+previous) across all tools. Two changes are flagged:
+    - a shift: the median r across tools (or the change in total jobs)
+      moves more than MAX_SHIFT, i.e. the whole market moved at once
+    - an outlier: a tool's r departs from the median by more than Z_LIMIT
+      standard deviations, and by more than the metric's smallest
+      flagged change.
+      The deviation is the robust spread of r across tools (1.4826 × MAD)
+      combined with the sampling noise expected from the postings behind
+      the tool's previous value, so small tools need a larger change to be
+      flagged than large ones
+
+Tools with fewer than MIN_SUPPORT postings in the previous run aren't tested
+one by one; a tool that disappeared is compared with a count of zero. The
+comparison reads three data files and runs in milliseconds for thousands
+of tools, so it can gate every refresh.
+
+Used by extract_data.py; not run directly.
+"""
+
+import json
+import math
+from array import array
+from statistics import median
+
+# Per-tool checks skip tools with fewer postings than this in the previous run
+MIN_SUPPORT = 30
+# Robust z-score beyond which a tool's change is implausible
+Z_LIMIT = 5.0
+# Largest plausible move of the whole market (median tool, total jobs) between runs
+MAX_SHIFT = 0.2
+# metric: (smallest relative change flagged for one tool,
+#          sampling variance of the metric's log times the postings behind it,
+#          whether it's a count, so a tool missing from the current run counts 0)
+METRICS = {
+    # Poisson counts: var(log n) ≈ 1/n
+    "job_count": (0.25, 1.0, True),
+    "co_mentions": (0.35, 1.0, True),
+    # Median of log salaries with a spread of ~0.45: (π/2)·0.45² per posting
+    "salary_p50": (0.15, 0.32, False),
+}
+# Added to counts so a tool that disappeared has a finite log ratio
+COUNT_OFFSET = 0.5
+
+
+def tool_metrics(tools, cooccurrence, salaries):
+    """Per-tool values and supports: {metric: {slug: (value, postings behind it)}}.
+
+    Metrics missing from older data files are left empty.
+    """
+    metrics = {name: {} for name in METRICS}
+    for tool in tools["tools"]:
+        metrics["job_count"][tool["slug"]] = (tool["job_count"], tool["job_count"])
+    for slug, pairs in cooccurrence.get("cooccurrence", {}).items():
+        total = sum(pair["count"] for pair in pairs)
+        metrics["co_mentions"][slug] = (total, total)
+    by_tool = salaries.get("tools")
+    if isinstance(by_tool, dict):
+        for slug, summary in by_tool.items():
+            if summary.get("p50"):
+                metrics["salary_p50"][slug] = (summary["p50"], summary["jobs"])
+    return metrics
+
+
+def load_run(directory, tools=None):
+    """The total jobs and tool_metrics() of the data files in directory.
+
+    tools is tools.json data to use instead of directory's (a run whose
+    tools.json isn't written yet). Returns None when there's no tools.json.
+    """
+    def read(name):
+        path = directory / name
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    if tools is None:
+        tools = read("tools.json")
+        if not tools:
+            return None
+    return {
+        "total_jobs": tools["total_jobs_analyzed"],
+        "metrics": tool_metrics(tools, read("cooccurrence.json"), read("salaries.json")),
+    }
+
+
+def compare_metric(name, previous, current):
+    """Anomalies of one metric, as (severity, message) pairs."""
+    min_change, noise, counts = METRICS[name]
+    slugs = [slug for slug, (_, support) in previous.items() if support >= MIN_SUPPORT]
+    if not counts:
+        # A median salary can't be compared with one that wasn't computed
+        slugs = [slug for slug in slugs if slug in current]
+    if len(slugs) < 2:
+        return []
+
+    offset = COUNT_OFFSET if counts else 0.0
+    before = array("d", (previous[slug][0] + offset for slug in slugs))
+    after = array("d", (current.get(slug, (0, 0))[0] + offset for slug in slugs))
+    # Sampling variance of r if nothing changed: both runs rest on about the previous support
+    variance = array("d", (2 * noise / previous[slug][1] for slug in slugs))
+    ratios = array("d", (math.log(a / b) for a, b in zip(after, before)))
+
+    anomalies = []
+    center = median(ratios)
+    if abs(math.expm1(center)) > MAX_SHIFT:
+        anomalies.append((math.inf, f"{name}: the median tool changed {math.expm1(center):+.0%} "
+                                    f"across {len(slugs):,} tools (limit ±{MAX_SHIFT:.0%})"))
+
+    spread = 1.4826 * median(abs(r - center) for r in ratios)
+    for slug, b, a, r, v in zip(slugs, before, after, ratios, variance):
+        change = math.expm1(r - center)
+        if abs(change) <= min_change:
+            continue
+        z = (r - center) / math.sqrt(spread * spread + v)
+        if abs(z) > Z_LIMIT:
+            anomalies.append((abs(z), f"{slug}: {name} {b - offset:,.0f} → {a - offset:,.0f} "
+                                      f"({math.expm1(r):+.0%}, z={z:+.1f})"))
+    return anomalies
+
+
+def find_anomalies(previous, current):
+    """Implausible changes from the previous run's load_run() to the current one's.
+
+    Returns messages, the whole-market shifts first, then tools by severity.
+    """
+    anomalies = []
+    if previous["total_jobs"]:
+        change = current["total_jobs"] / previous["total_jobs"] - 1
+        if abs(change) > MAX_SHIFT:
+            anomalies.append((math.inf, f"total jobs {previous['total_jobs']:,} → {current['total_jobs']:,} "
+                                        f"({change:+.0%}, limit ±{MAX_SHIFT:.0%})"))
+    for name in METRICS:
+        anomalies += compare_metric(name, previous["metrics"][name], current["metrics"][name])
+    anomalies.sort(key=lambda anomaly: -anomaly[0])
+    return [message for _, message in anomalies]
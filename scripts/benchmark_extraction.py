@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+benchmark_extraction.py — Time every extraction stage on synthetic data at several sizes.
+
+For each size, a SQLite database is generated with generate_synthetic_jobs.py
+(kept in BENCH_DIR and reused by later runs with the same parameters), pulled
+into a local incidence snapshot, and extracted with extract_from_snapshot()
+while the query profile times each stage. Stage times are printed side by
+side, with how each stage scales from the smallest size to the largest:
+an exponent of 1.0 is linear in jobs, 2.0 quadratic.
+
+Snapshots and staged outputs go to a scratch directory; data/ is not touched.
+
+Usage:
+    python3 scripts/benchmark_extraction.py                      # 10k and 1m jobs
+    python3 scripts/benchmark_extraction.py --sizes 10k,1m,10m --tools 300 --tools-per-job 3
+    python3 scripts/benchmark_extraction.py --json benchmark.json
+"""
+
+import argparse
+import json
+import math
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+import checkpoints
+import extract_data
+import generate_synthetic_jobs
+import incidence_snapshot
+import query_profile
+
+BENCH_DIR = Path(__file__).resolve().parent.parent / ".extract_cache" / "bench"
+STAGES = ["pull", "tools", "incidence", "trends", "trend_cube", "salaries", "companies", "details"]
+
+
+def bench_database(jobs, args):
+    """SQLite file with jobs synthetic jobs for these parameters, generated on first use."""
+    path = BENCH_DIR / (f"jobs_{jobs}_{args.tools}t_{args.tools_per_job:g}tpj_"
+                        f"{args.months}m_seed{args.seed}.db")
+    if path.exists():
+        return path
+    print(f"Generating {jobs:,} jobs...")
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    generate_synthetic_jobs.write_sqlite(tmp_path, generate_synthetic_jobs.generate(
+        jobs, args.tools, args.tools_per_job, args.months, args.seed,
+    ))
+    tmp_path.rename(path)
+    return path
+
+
+def run_size(jobs, args):
+    """Pull and extract one synthetic database. Returns its counts and stage seconds."""
+    path = bench_database(jobs, args)
+    print(f"Extracting {path.name}...")
+    with tempfile.TemporaryDirectory(dir=BENCH_DIR) as scratch:
+        scratch = Path(scratch)
+        # Stages stream their data files into the staging area; keep it off the real one
+        checkpoints.STAGING_DIR = scratch / "staging"
+        checkpoints.STAGING_DIR.mkdir()
+        query_profile.activate()
+
+        start = perf_counter()
+        manifest = incidence_snapshot.pull_sqlite_snapshot(path, scratch / "snapshot")
+        pull_seconds = perf_counter() - start
+        results = extract_data.extract_from_snapshot(
+            incidence_snapshot.load_snapshot(scratch / "snapshot"), args.cube_months,
+        )
+        stages = query_profile.build_profile()["stages"]
+
+    seconds = {"pull": round(pull_seconds, 4), **{name: stages[name]["seconds"] for name in STAGES[1:]}}
+    return {
+        "jobs": jobs,
+        "jobs_with_tools": manifest["jobs"],
+        "tool_mentions": manifest["rows"],
+        "tools": len(results["tools"]),
+        "seconds": seconds,
+        "total_seconds": round(sum(seconds.values()), 4),
+    }
+
+
+def scaling_exponent(first, last, stage):
+    """log(time ratio) / log(jobs ratio) between two runs, or None when it can't be measured."""
+    t1, t2 = first["seconds"][stage], last["seconds"][stage]
+    if first["jobs"] == last["jobs"] or t1 <= 0 or t2 <= 0:
+        return None
+    return math.log(t2 / t1) / math.log(last["jobs"] / first["jobs"])
+
+
+def print_table(runs):
+    header = f"{'stage':<12}" + "".join(f"{run['jobs']:>12,}" for run in runs) + f"{'exponent':>10}"
+    print("\n" + header)
+    print("-" * len(header))
+    for stage in [*STAGES, "total"]:
+        values = [run["total_seconds"] if stage == "total" else run["seconds"][stage] for run in runs]
+        exponent = None
+        if stage != "total" and len(runs) > 1:
+            exponent = scaling_exponent(runs[0], runs[-1], stage)
+        print(f"{stage:<12}" + "".join(f"{value:>11.2f}s" for value in values)
+              + (f"{exponent:>10.2f}" if exponent is not None else f"{'':>10}"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the extraction stages on synthetic data")
+    parser.add_argument("--sizes", default="10k,1m",
+                        help="Comma-separated job counts: presets (10k, 1m, 10m) or numbers (default: 10k,1m)")
+    parser.add_argument("--tools", type=int, default=150, help="Site tools mentioned (default: 150)")
+    parser.add_argument("--tools-per-job", type=float, default=2.5,
+                        help="Mean tool mentions per job (default: 2.5)")
+    parser.add_argument("--months", type=int, default=generate_synthetic_jobs.MONTHS,
+                        help=f"Months of postings (default: {generate_synthetic_jobs.MONTHS})")
+    parser.add_argument("--cube-months", type=int, default=extract_data.TREND_CUBE_MONTHS,
+                        help=f"Months covered by the trend cube (default: {extract_data.TREND_CUBE_MONTHS})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+    try:
+        args.sizes = sorted(generate_synthetic_jobs.parse_size(size) for size in args.sizes.split(","))
+    except argparse.ArgumentTypeError as e:
+        parser.error(f"--sizes: {e}")
+    return args
+
+
+def main():
+    args = parse_args()
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+
+    runs = [run_size(jobs, args) for jobs in args.sizes]
+    print_table(runs)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "generated_at": datetime.now().isoformat(),
+                "tools": args.tools,
+                "tools_per_job": args.tools_per_job,
+                "months": args.months,
+                "cube_months": args.cube_months,
+                "seed": args.seed,
+                "runs": runs,
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
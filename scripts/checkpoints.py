@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+checkpoints.py — Staging area and stage manifest for resumable extractions.
+
+Every stage of an extraction writes its output into the staging area, and
+completed stages are recorded in a stage manifest. Both are written to a temp
+file and renamed into place, so a stage is either fully checkpointed or not
+at all. The manifest carries the run's extraction key (database fingerprint
+plus extractor code); a resumed run only reuses stages recorded under the
+same key, i.e. against the same state of the database.
+
+Layout:
+    .extract_cache/staging/manifest.json        run key and completed stages
+    .extract_cache/staging/stage_<name>.json    value returned by each stage
+    .extract_cache/staging/details/<n>.json     per-tool details, one file per chunk
+    .extract_cache/staging/<data file>          outputs streamed by their stages
+
+Once the whole run has succeeded, promote() moves the staged data files into
+data/ (skipping those whose content didn't change) and clears the staging area.
+
+Used by extract_data.py; not run directly.
+"""
+
+import json
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import data_files
+
+STAGING_DIR = Path(__file__).resolve().parent.parent / ".extract_cache" / "staging"
+
+# Stages may finish concurrently (extract_data.py --parallel)
+_lock = threading.Lock()
+
+
+def write_json_atomic(path, data):
+    """Write a staging file atomically (see data_files.write_atomic())."""
+    data_files.write_atomic(path, data, compact=True)
+
+
+def staged_path(name):
+    """Where a stage writes the data file it streams (moved to data/ by promote())."""
+    return STAGING_DIR / name
+
+
+def open_run(key, resume=False):
+    """Return the stage manifest for this run.
+
+    With resume and a manifest recorded under the same key, its completed
+    stages are kept. Otherwise the staging area is cleared and a new
+    manifest started. A key of None (runs that can't be fingerprinted)
+    never resumes.
+    """
+    path = STAGING_DIR / "manifest.json"
+    if resume and key is not None and path.exists():
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get("key") == key:
+            return manifest
+
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    (STAGING_DIR / "details").mkdir(parents=True)
+    manifest = {"key": key, "started_at": datetime.now().isoformat(), "stages": {}}
+    write_json_atomic(path, manifest)
+    return manifest
+
+
+def run_stage(manifest, name, stage, *args):
+    """Return stage(*args), or its checkpointed value if the stage already completed."""
+    if name in manifest["stages"]:
+        with open(STAGING_DIR / f"stage_{name}.json") as f:
+            return json.load(f)
+
+    result = stage(*args)
+    write_json_atomic(STAGING_DIR / f"stage_{name}.json", result)
+    with _lock:
+        manifest["stages"][name] = datetime.now().isoformat()
+        write_json_atomic(STAGING_DIR / "manifest.json", manifest)
+    return result
+
+
+def load_details():
+    """Per-tool details checkpointed so far: {slug: details}."""
+    details = {}
+    for path in sorted((STAGING_DIR / "details").glob("*.json")):
+        with open(path) as f:
+            details.update(json.load(f))
+    return details
+
+
+def save_details(details):
+    """Checkpoint the details of one chunk of tools."""
+    with _lock:
+        index = len(list((STAGING_DIR / "details").glob("*.json")))
+        write_json_atomic(STAGING_DIR / "details" / f"{index:05d}.json", details)
+
+
+def promote(names, output_dir):
+    """Move the staged data files into output_dir and clear the staging area.
+
+    Files whose content is unchanged are left alone. Returns the names of
+    the files that were replaced.
+    """
+    changed = [name for name in names if data_files.replace_if_changed(staged_path(name), output_dir / name)]
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    return changed
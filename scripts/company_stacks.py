@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+company_stacks.py — Per-company job counts and tool stacks as bitsets.
+
+companies.json lists every company with at least one posting that mentions a
+site tool:
+    tool_index   site tool slugs; bit i of a stack stands for tool_index[i]
+    companies    [{"name", "jobs", "tools"}], most jobs first, where jobs
+                 counts the company's distinct postings mentioning a site
+                 tool and tools is its stack as a hex bitset
+
+The index is ordered by the number of companies using each tool, so common
+tools take the low bits and stacks stay short. Stack queries are bitwise:
+"uses Salesforce and Clay but not ZoomInfo" is
+    stack & want == want and not stack & avoid
+with want and avoid from tool_mask(); see companies_matching().
+
+Used by extract_data.py and generate_weekly_email.py; not run directly.
+"""
+
+from collections import defaultdict
+
+
+def build_companies(rows, tool_slug):
+    """Build the companies.json body from company rows.
+
+    rows are (company, tool_name, jobs) with tool_name None for the company's
+    total of distinct jobs. tool_slug maps tool names to site tool slugs.
+    """
+    jobs, stacks = {}, defaultdict(set)
+    for company, tool_name, count in rows:
+        if tool_name is None:
+            jobs[company] = count
+        else:
+            stacks[company].add(tool_slug(tool_name))
+    return encode_companies(jobs, stacks)
+
+
+def encode_companies(jobs, stacks):
+    """companies.json body from {company: jobs} and {company: set of tool slugs}."""
+    users = defaultdict(int)
+    for slugs in stacks.values():
+        for slug in slugs:
+            users[slug] += 1
+    tool_index = sorted(users, key=lambda slug: (-users[slug], slug))
+    bits = {slug: 1 << i for i, slug in enumerate(tool_index)}
+
+    companies = [
+        {"name": name, "jobs": count, "tools": format(sum(bits[s] for s in stacks.get(name, ())), "x")}
+        for name, count in sorted(jobs.items(), key=lambda item: (-item[1], item[0]))
+    ]
+    return {"tool_index": tool_index, "company_count": len(companies), "companies": companies}
+
+
+def decode_stacks(data):
+    """({company: jobs}, {company: set of tool slugs}) from a companies.json body."""
+    jobs, stacks = {}, {}
+    for company in data["companies"]:
+        stack = int(company["tools"], 16)
+        jobs[company["name"]] = company["jobs"]
+        stacks[company["name"]] = {slug for i, slug in enumerate(data["tool_index"]) if stack >> i & 1}
+    return jobs, stacks
+
+
+def merge_companies(previous, delta):
+    """Add delta's job counts to previous and union their stacks (the indexes may differ)."""
+    jobs, stacks = decode_stacks(previous)
+    delta_jobs, delta_stacks = decode_stacks(delta)
+    for name, count in delta_jobs.items():
+        jobs[name] = jobs.get(name, 0) + count
+        stacks[name] = stacks.get(name, set()) | delta_stacks[name]
+    return encode_companies(jobs, stacks)
+
+
+def tool_mask(data, slugs):
+    """Bitmask of the given tool slugs; tools outside the index match no company."""
+    position = {slug: i for i, slug in enumerate(data["tool_index"])}
+    return sum(1 << position[slug] for slug in slugs if slug in position)
+
+
+def companies_matching(data, all_of=(), none_of=()):
+    """Companies whose stack has every tool in all_of and none in none_of, most jobs first."""
+    if any(slug not in data["tool_index"] for slug in all_of):
+        return []
+    want, avoid = tool_mask(data, all_of), tool_mask(data, none_of)
+    matches = []
+    for company in data["companies"]:
+        stack = int(company["tools"], 16)
+        if stack & want == want and not stack & avoid:
+            matches.append(company)
+    return matches
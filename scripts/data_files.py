@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+data_files.py — Atomic, change-aware writer for the data/ JSON files.
+
+Every file is written to a temp file next to it and renamed into place, so
+readers (astro dev, a concurrent build) never see a half-written file.
+
+A file is only rewritten when its content changed. Content is compared by a
+hash of the canonical JSON (sorted keys, compact) with the top-level
+VOLATILE_KEYS removed, so a run that reproduces the same data leaves the
+file, its generated_at and its mtime as they were, and Astro's build cache
+and git only see files whose data actually changed.
+
+Used by extract_data.py and checkpoints.py; not run directly.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Run timestamps that change on every write without the data changing
+VOLATILE_KEYS = ("generated_at", "last_updated", "last_full_extraction")
+
+
+def content_hash(data):
+    """sha256 of data as canonical JSON, ignoring top-level VOLATILE_KEYS."""
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def file_hash(path):
+    """content_hash() of a JSON file, or None when it's missing or unreadable."""
+    try:
+        with open(path) as f:
+            return content_hash(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def write_atomic(path, data, compact=False):
+    """json.dump data to a temp file next to path, then rename it into place."""
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            if compact:
+                json.dump(data, f, separators=(",", ":"))
+            else:
+                json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_if_changed(path, data, compact=False):
+    """Write data to path unless the file already holds the same content.
+
+    Returns True when the file was written.
+    """
+    if file_hash(path) == content_hash(data):
+        return False
+    write_atomic(path, data, compact)
+    return True
+
+
+def replace_if_changed(source, path):
+    """Move the JSON file source onto path unless path already holds the same content.
+
+    source is removed either way. Returns True when path was replaced.
+    """
+    if path.exists() and file_hash(path) == file_hash(source):
+        source.unlink()
+        return False
+    os.replace(source, path)
+    return True
+
+
+def write_all(files, compact=(), workers=4):
+    """Serialize and write {path: data} concurrently with write_if_changed().
+
+    Files whose names are in compact are written with compact separators.
+    Returns the paths that were written.
+    """
+    def write(item):
+        path, data = item
+        return path, write_if_changed(path, data, path.name in compact)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [path for path, written in executor.map(write, files.items()) if written]
@@ -9,6 +9,8 @@ import json
 import re
 import sys
 
+import tool_registry
+
 DATA = "/Users/rome/Documents/projects/datastackguide/data"
 
 
@@ -38,7 +40,7 @@ def extract_coverage(alt_slug, tc, tools_meta):
     """Generate coverage text from tool_content data."""
     content = tc.get(alt_slug, {})
     meta = tools_meta.get(alt_slug, {})
-    name = content.get('display_name', alt_slug)
+    name = tool_registry.display_name(alt_slug)
 
     # Get key data points
     overview = content.get('overview', [])
@@ -93,9 +95,8 @@ def extract_coverage(alt_slug, tc, tools_meta):
 def extract_verdict(alt_slug, main_slug, tc, tools_meta):
     """Generate verdict text from tool_content data."""
     content = tc.get(alt_slug, {})
-    main_content = tc.get(main_slug, {})
-    name = content.get('display_name', alt_slug)
-    main_name = main_content.get('display_name', main_slug)
+    name = tool_registry.display_name(alt_slug)
+    main_name = tool_registry.display_name(main_slug)
 
     best_for = content.get('best_for', '')
     cons = content.get('cons', [])
@@ -116,8 +117,7 @@ def extract_verdict(alt_slug, main_slug, tc, tools_meta):
 def generate_faqs(page, tc, tools_meta):
     """Generate 3 FAQs for an alternatives page."""
     tool_slug = page.get('tool_slug', '')
-    tool_content = tc.get(tool_slug, {})
-    tool_name = tool_content.get('display_name', tool_slug)
+    tool_name = tool_registry.display_name(tool_slug)
     alt_entries = page.get('alternatives_list', [])
 
     faqs = []
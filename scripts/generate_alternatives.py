@@ -11,6 +11,8 @@ import json
 import sys
 from datetime import date
 
+import tool_registry
+
 DATA_DIR = "data"
 MIN_JOBS = 0  # Generate for all tools with content
 TODAY = date.today().isoformat()
@@ -32,7 +34,7 @@ def get_alt_entry(slug, tc, tools_meta, cooc):
     if not content:
         return None
 
-    name = content.get('display_name', slug)
+    name = tool_registry.display_name(slug)
     alts_slugs = content.get('alternatives', [])
 
     # Filter to alternatives that have tool_content entries
@@ -45,7 +47,7 @@ def get_alt_entry(slug, tc, tools_meta, cooc):
     for alt_slug in valid_alts[:7]:
         alt = tc[alt_slug]
         alt_meta = tools_meta.get(alt_slug, {})
-        alt_name = alt.get('display_name', alt_slug)
+        alt_name = tool_registry.display_name(alt_slug)
 
         # Get pricing summary
         pricing = alt.get('pricing', {})
@@ -16,6 +16,8 @@ import json
 import sys
 import re
 
+import tool_registry
+
 DATA_DIR = "data"
 TARGET_FAQ_COUNT = 5
 
@@ -42,7 +44,7 @@ def format_salary(val):
 
 def make_pricing_faq(slug, content, tool_meta):
     """Generate a pricing FAQ from existing pricing data."""
-    name = content.get('display_name', slug)
+    name = tool_registry.display_name(slug)
     pricing = content.get('pricing', {})
     tiers = pricing.get('tiers', [])
 
@@ -85,7 +87,7 @@ def make_pricing_faq(slug, content, tool_meta):
 
 def make_demand_faq(slug, content, tool_meta, detail):
     """Generate a job demand FAQ from job posting data."""
-    name = content.get('display_name', slug)
+    name = tool_registry.display_name(slug)
     job_count = tool_meta.get('job_count', 0)
     companies = tool_meta.get('unique_companies', 0)
     sal_min = tool_meta.get('salary_min')
@@ -121,18 +123,16 @@ def make_demand_faq(slug, content, tool_meta, detail):
 
 def make_alternatives_faq(slug, content, tool_meta):
     """Generate an alternatives FAQ."""
-    name = content.get('display_name', slug)
+    name = tool_registry.display_name(slug)
     alts = content.get('alternatives', [])
 
     if not alts or len(alts) < 2:
         return None
 
     # Get display names for alternatives
-    tc = load("tool_content.json")
     alt_names = []
     for alt_slug in alts[:5]:
-        alt_content = tc.get(alt_slug, {})
-        alt_name = alt_content.get('display_name', alt_slug)
+        alt_name = tool_registry.display_name(alt_slug)
         alt_names.append(alt_name)
 
     if not alt_names:
@@ -155,7 +155,7 @@ def make_alternatives_faq(slug, content, tool_meta):
 
 def make_comparison_faq(slug, content, cooc):
     """Generate a comparison FAQ with the top co-occurring tool."""
-    name = content.get('display_name', slug)
+    name = tool_registry.display_name(slug)
     tc = load("tool_content.json")
 
     if not cooc:
@@ -171,7 +171,7 @@ def make_comparison_faq(slug, content, cooc):
     if not comp_slug:
         return None
 
-    comp_name = tc[comp_slug].get('display_name', comp_slug)
+    comp_name = tool_registry.display_name(comp_slug)
 
     # Build comparison from pros/cons
     our_pros = content.get('pros', [])[:2]
@@ -195,7 +195,7 @@ def make_comparison_faq(slug, content, cooc):
 
 def make_bestfor_faq(slug, content):
     """Generate a use-case/best-for FAQ."""
-    name = content.get('display_name', slug)
+    name = tool_registry.display_name(slug)
     best_for = content.get('best_for', '')
     not_for = content.get('not_for', '')
     categories = []
@@ -8,6 +8,8 @@ import json
 import sys
 from datetime import date
 
+import tool_registry
+
 DATA = "/Users/rome/Documents/projects/datastackguide/data"
 TODAY = date.today().isoformat()
 MIN_COOCCURRENCE = 5
@@ -271,9 +273,11 @@ def main():
         existing_pairs.add((i['tool_a'], i['tool_b']))
         existing_pairs.add((i['tool_b'], i['tool_a']))
 
-    # Collect all candidate pairs
+    # Collect all candidate pairs. Lift (observed / expected co-mentions) ranks
+    # pairs that are genuinely used together above pairs of two popular tools.
     cooc_data = cooc.get('cooccurrence', cooc)
     pair_counts = {}
+    pair_lift = {}
     for tool_slug, co_tools in cooc_data.items():
         if tool_slug not in tc:
             continue
@@ -284,15 +288,18 @@ def main():
                 if other and other in tc and count >= MIN_COOCCURRENCE:
                     pair = tuple(sorted([tool_slug, other]))
                     pair_counts[pair] = max(pair_counts.get(pair, 0), count)
+                    pair_lift[pair] = max(pair_lift.get(pair, 0), entry.get('lift', 0))
         elif isinstance(co_tools, dict):
             for other, count in co_tools.items():
                 if other in tc and count >= MIN_COOCCURRENCE:
                     pair = tuple(sorted([tool_slug, other]))
                     pair_counts[pair] = max(pair_counts.get(pair, 0), count)
 
-    # Sort by count, exclude existing
+    # Sort by lift, then count, exclude existing
     candidates = [
-        (pair, count) for pair, count in sorted(pair_counts.items(), key=lambda x: -x[1])
+        (pair, count) for pair, count in sorted(
+            pair_counts.items(), key=lambda x: (-pair_lift.get(x[0], 0), -x[1])
+        )
         if pair not in existing_pairs
     ]
 
@@ -301,8 +308,8 @@ def main():
 
     added = 0
     for (a, b), count in candidates:
-        a_name = tc[a].get('display_name', a)
-        b_name = tc[b].get('display_name', b)
+        a_name = tool_registry.display_name(a)
+        b_name = tool_registry.display_name(b)
 
         # Put higher-job-count tool first for consistency
         a_jobs = tools_meta.get(a, {}).get('job_count', 0)
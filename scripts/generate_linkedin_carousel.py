@@ -12,11 +12,14 @@ Requires: Pillow (pip install Pillow)
 """
 
 import json
+import math
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import tool_registry
+
 try:
     from PIL import Image, ImageDraw, ImageFont
 except ImportError:
@@ -42,7 +45,10 @@ W, H = 1080, 1350
 
 
 def load_json(filename):
-    with open(DATA_DIR / filename) as f:
+    path = DATA_DIR / filename
+    if not path.exists():
+        sys.exit(f"data/{filename} not found; run scripts/extract_data.py first")
+    with open(path) as f:
         return json.load(f)
 
 
@@ -186,8 +192,19 @@ def create_slide_2_demand(trends):
     return img
 
 
-def create_slide_3_trending(trends):
-    """Fastest growing tool this week."""
+def top_grower(momentum):
+    """Tool with the highest growth score in momentum.json, with its shrunk growth in percent.
+
+    Returns None when no tool is growing.
+    """
+    for t in momentum["tools"]:
+        if t["growth_score"] > 0:
+            return {**t, "change": round(math.expm1(t["growth_score"]) * 100)}
+    return None
+
+
+def create_slide_3_trending(momentum):
+    """Fastest growing tool over the last few weeks."""
     img = Image.new("RGB", (W, H), DARK_BG)
     draw = ImageDraw.Draw(img)
     draw.rectangle([0, 0, W, 6], fill=TEAL)
@@ -200,22 +217,10 @@ def create_slide_3_trending(trends):
     font_label = get_font(20)
 
     draw.text((W // 2, 100), "🚀 Fastest Growing", font=font_title, fill=WHITE, anchor="mm")
-    draw.text((W // 2, 155), "Biggest month-over-month jump", font=font_sub, fill=MUTED, anchor="mm")
+    draw.text((W // 2, 155), f"Biggest {momentum['window_weeks']}-week jump", font=font_sub, fill=MUTED, anchor="mm")
     draw_teal_accent(draw, 195)
 
-    months = sorted(trends["trends"].keys(), reverse=True)
-    latest = trends["trends"][months[0]]
-    prev = trends["trends"][months[1]] if len(months) > 1 else []
-    prev_lookup = {t["slug"]: t["mentions"] for t in prev}
-
-    grower = None
-    best_change = 0
-    for t in latest:
-        if t["mentions"] > 10 and t["slug"] in prev_lookup and prev_lookup[t["slug"]] > 0:
-            change = round(((t["mentions"] - prev_lookup[t["slug"]]) / prev_lookup[t["slug"]]) * 100)
-            if change > best_change:
-                best_change = change
-                grower = {**t, "change": change, "prev": prev_lookup[t["slug"]]}
+    grower = top_grower(momentum)
 
     if grower:
         # Big card
@@ -226,11 +231,11 @@ def create_slide_3_trending(trends):
         draw.text((W // 2, 580), f"▲ {grower['change']}%", font=font_change, fill=GREEN, anchor="mm")
 
         draw.text((W // 2, 700),
-                  f"{grower['prev']:,} → {grower['mentions']:,} mentions",
+                  f"{grower['previous']:,} → {grower['recent']:,} mentions",
                   font=font_detail, fill=MUTED, anchor="mm")
 
         draw.text((W // 2, 770),
-                  f"Month over month growth",
+                  f"Last {momentum['window_weeks']} weeks vs the {momentum['window_weeks']} before",
                   font=font_detail, fill=MUTED, anchor="mm")
     else:
         draw.text((W // 2, 600), "No significant growth this period", font=font_detail, fill=MUTED, anchor="mm")
@@ -297,8 +302,38 @@ def create_slide_4_seniority(tool_details):
     return img
 
 
-def create_slide_5_stack(cooccurrence):
-    """Most common tool pairings."""
+def stack_lines(draw, names, font, max_width, max_lines=2):
+    """Tool names joined with "+", wrapped into at most max_lines lines of max_width.
+
+    Names that don't fit are summed up as "N more"; a name too wide for a
+    line on its own is shortened with "…".
+    """
+    def render(line, first):
+        return ("" if first else "+  ") + "  +  ".join(line)
+
+    def fits(text):
+        return draw.textlength(text, font=font) <= max_width
+
+    lines = [[]]
+    for i, name in enumerate(names):
+        while len(name) > 1 and not fits(f"+  {name}"):
+            name = name[:-2] + "…"
+        if fits(render(lines[-1] + [name], len(lines) == 1)):
+            lines[-1].append(name)
+        elif len(lines) < max_lines:
+            lines.append([name])
+        else:
+            rest = len(names) - i
+            while lines[-1] and not fits(render(lines[-1] + [f"{rest} more"], len(lines) == 1)):
+                lines[-1].pop()
+                rest += 1
+            lines[-1].append(f"{rest} more")
+            break
+    return [render(line, i == 0) for i, line in enumerate(lines)]
+
+
+def create_slide_5_stack(stacks):
+    """Most common multi-tool stacks (3+ tools), mined by extract_data.py."""
     img = Image.new("RGB", (W, H), DARK_BG)
     draw = ImageDraw.Draw(img)
     draw.rectangle([0, 0, W, 6], fill=TEAL)
@@ -313,37 +348,24 @@ def create_slide_5_stack(cooccurrence):
     draw.text((W // 2, 155), "Tools found together in job postings", font=font_sub, fill=MUTED, anchor="mm")
     draw_teal_accent(draw, 195)
 
-    # Collect top pairs
-    all_pairs = []
-    seen = set()
-    for key, pairs in cooccurrence.get("cooccurrence", {}).items():
-        for p in pairs[:3]:
-            pair_key = tuple(sorted([key, p["slug"]]))
-            if pair_key not in seen:
-                seen.add(pair_key)
-                display_a = " ".join(w.capitalize() for w in key.split("-"))
-                all_pairs.append({
-                    "a": display_a,
-                    "b": p["tool"],
-                    "count": p["count"],
-                })
-
-    all_pairs.sort(key=lambda x: x["count"], reverse=True)
-    top_pairs = all_pairs[:5]
+    # stacks.json is ordered by size, then postings; show the biggest stacks first
+    top_stacks = sorted(stacks.get("stacks", []), key=lambda x: x["jobs"], reverse=True)[:5]
 
     y_start = 300
-    for i, pair in enumerate(top_pairs):
+    for i, stack in enumerate(top_stacks):
         y = y_start + i * 170
         draw_rounded_rect(draw, (80, y, W - 80, y + 130), 16, CARD_BG)
 
-        # Pair names
-        draw.text((120, y + 35), pair["a"], font=font_pair, fill=TEAL_LIGHT, anchor="lm")
-        draw.text((120 + len(pair["a"]) * 16, y + 35), "  +  ", font=font_pair, fill=MUTED, anchor="lm")
-        draw.text((120, y + 80), pair["b"], font=font_pair, fill=TEAL_LIGHT, anchor="lm")
+        # Stack names on up to two lines, clear of the count on the right
+        count = f"{stack['jobs']}"
+        count_width = max(draw.textlength(count, font=font_num), draw.textlength("postings", font=font_label))
+        lines = stack_lines(draw, stack["tools"], font_pair, W - 240 - count_width - 40)
+        for line, line_y in zip(lines, (y + 35, y + 80) if len(lines) > 1 else (y + 58,)):
+            draw.text((120, line_y), line, font=font_pair, fill=TEAL_LIGHT, anchor="lm")
 
         # Count
         draw.text((W - 120, y + 55),
-                  f"{pair['count']}", font=font_num, fill=WHITE, anchor="rm")
+                  count, font=font_num, fill=WHITE, anchor="rm")
         draw.text((W - 120, y + 90),
                   "postings", font=font_label, fill=MUTED, anchor="rm")
 
@@ -385,7 +407,7 @@ def create_slide_6_cta(market):
     return img
 
 
-def generate_post_text(output_dir, market, trends, cooccurrence):
+def generate_post_text(output_dir, market, trends, momentum, cooccurrence):
     """Generate a LinkedIn post text file with rotating hooks and key stats."""
 
     total_tools = market.get("total_tools_tracked", 0)
@@ -397,20 +419,13 @@ def generate_post_text(output_dir, market, trends, cooccurrence):
     top_tool_name = top_tools[0]["name"] if top_tools else "Salesforce"
     top_tool_jobs = top_tools[0]["job_count"] if top_tools else 0
 
-    # Fastest growing tool (same logic as slide 3)
+    # Fastest growing tool (same as slide 3)
     months = sorted(trends.get("trends", {}).keys(), reverse=True)
     latest_list = trends["trends"].get(months[0], []) if months else []
-    prev_list = trends["trends"].get(months[1], []) if len(months) > 1 else []
-    prev_lookup = {t["slug"]: t["mentions"] for t in prev_list}
-
-    grower_name = None
-    grower_change = 0
-    for t in latest_list:
-        if t["mentions"] > 10 and t["slug"] in prev_lookup and prev_lookup[t["slug"]] > 0:
-            change = round(((t["mentions"] - prev_lookup[t["slug"]]) / prev_lookup[t["slug"]]) * 100)
-            if change > grower_change:
-                grower_change = change
-                grower_name = t["tool"]
+    grower = top_grower(momentum)
+    grower_name = grower["tool"] if grower else None
+    grower_change = grower["change"] if grower else 0
+    window = momentum["window_weeks"]
 
     # Top co-occurrence pair
     top_pair = None
@@ -423,7 +438,7 @@ def generate_post_text(output_dir, market, trends, cooccurrence):
                 seen.add(pair_key)
                 if p["count"] > best_count:
                     best_count = p["count"]
-                    display_a = " ".join(w.capitalize() for w in key.split("-"))
+                    display_a = tool_registry.display_name(key)
                     top_pair = (display_a, p["tool"], p["count"])
 
     # Count how many tools in latest month had 50+ mentions
@@ -446,7 +461,7 @@ def generate_post_text(output_dir, market, trends, cooccurrence):
     # Hook 3: fastest grower
     if grower_name and grower_change > 0:
         candidates.append(
-            f"{grower_name} job mentions jumped {grower_change}% month over month. Here's what's driving it."
+            f"{grower_name} job mentions jumped {grower_change}% in the last {window} weeks. Here's what's driving it."
         )
 
     # Hook 4: tool count
@@ -477,7 +492,7 @@ def generate_post_text(output_dir, market, trends, cooccurrence):
 
     # Bullet: fastest grower
     if grower_name and grower_change > 0:
-        bullets.append(f"Fastest grower: {grower_name} ({grower_change}% MoM)")
+        bullets.append(f"Fastest grower: {grower_name} (+{grower_change}% over {window} weeks)")
 
     # Bullet: top pairing
     if top_pair:
@@ -521,16 +536,18 @@ def main():
     # Load data
     market = load_json("market_signals.json")
     trends = load_json("trends.json")
+    momentum = load_json("momentum.json")
     cooccurrence = load_json("cooccurrence.json")
+    stacks = load_json("stacks.json")
     tool_details = load_json("tool_details.json")
 
     # Generate slides
     slides = [
         ("01-cover", create_slide_1_cover(market, trends)),
         ("02-demand", create_slide_2_demand(trends)),
-        ("03-trending", create_slide_3_trending(trends)),
+        ("03-trending", create_slide_3_trending(momentum)),
         ("04-seniority", create_slide_4_seniority(tool_details)),
-        ("05-stack-combos", create_slide_5_stack(cooccurrence)),
+        ("05-stack-combos", create_slide_5_stack(stacks)),
         ("06-cta", create_slide_6_cta(market)),
     ]
 
@@ -548,7 +565,7 @@ def main():
     print(f"Saved PDF: {pdf_path}")
 
     # Generate LinkedIn post text
-    generate_post_text(output_dir, market, trends, cooccurrence)
+    generate_post_text(output_dir, market, trends, momentum, cooccurrence)
 
     print(f"\nDone! {len(slides)} slides + 1 PDF + post.txt in {output_dir}/")
 
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+generate_synthetic_jobs.py — Synthetic jobs/job_tools data for benchmarking extract_data.py.
+
+Generates postings whose shape follows the production data:
+    tools          popularity falls off as a power law (ZIPF_EXPONENT), and each
+                   tool's share drifts over the window, so some rise and some fade;
+                   EXCLUDED_SHARE of mentions go to categories the site leaves out
+    tools per job  Poisson with mean --tools-per-job (some jobs mention none)
+    companies      one per JOBS_PER_COMPANY jobs, power-law sized, each with a stage
+    seniority,     drawn from the production mix; titles are built from both
+    function
+    salaries       log-normal around a median per seniority, on SALARY_SHARE of jobs
+                   (a few below the $30K cutoff, like hourly postings)
+    date_posted    spread over --months up to today, volume growing by GROWTH over
+                   the window; job ids follow posting order, like the scraper's
+Tool names and categories come from data/tools.json, padded with "Tool N".
+
+The output is a SQLite file, which extract_data.py reads with
+--db sqlite:///path, or with --db, new jobs/job_tools tables in an empty
+Postgres database for profiling the SQL stages at scale.
+
+Usage:
+    python3 scripts/generate_synthetic_jobs.py --jobs 1m .extract_cache/bench/jobs_1m.db
+    python3 scripts/generate_synthetic_jobs.py --jobs 10k --tools 300 --tools-per-job 4 jobs.db
+    python3 scripts/generate_synthetic_jobs.py --jobs 10m --db postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import psycopg2
+
+from extract_data import OUTPUT_DIR, SITE_DB_CATEGORIES
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+# Jobs generated and written per batch
+BATCH_JOBS = 50_000
+
+ZIPF_EXPONENT = 1.1
+# Standard deviation of a tool's log share change across the window
+DRIFT = 0.5
+EXCLUDED_SHARE = 0.1
+EXCLUDED_TOOLS = [
+    ("Python", "AI_languages"),
+    ("PyTorch", "AI_infrastructure"),
+    ("RAG", "AI_techniques"),
+    ("Excel", "_none"),
+]
+
+JOBS_PER_COMPANY = 12
+NO_COMPANY_SHARE = 0.02
+COMPANY_STAGES = {"Unknown": 60, "Public": 15, "Growth": 10, "Series B": 7, "Series A": 5, "Seed": 3}
+
+SENIORITY = {"mid": 30, "senior": 24, "entry": 20, "director": 13, "vp": 3,
+             "head_of": 2, "c_level": 1, "unknown": 7}
+SENIORITY_TITLES = {"entry": "Junior ", "senior": "Senior ", "director": "Director, ", "vp": "VP, ",
+                    "head_of": "Head of ", "c_level": "Chief "}
+MEDIAN_SALARY = {"entry": 60000, "mid": 90000, "senior": 125000, "director": 160000, "vp": 200000,
+                 "head_of": 175000, "c_level": 240000, "unknown": 95000}
+SALARY_SIGMA = 0.25
+SALARY_SHARE = 0.45
+HOURLY_SHARE = 0.03
+
+FUNCTIONS = {"sales": 43, "other": 25, "marketing": 8, "engineering": 7, "data": 4,
+             "operations": 4, "finance": 2, "product": 1.5, "people": 0.7, "legal": 0.4}
+ROLES = {
+    "sales": ["Account Executive", "Sales Development Representative", "Business Development Representative",
+              "Sales Operations Manager", "Inside Sales Representative"],
+    "other": ["Customer Success Manager", "Implementation Consultant", "Project Manager"],
+    "marketing": ["Marketing Operations Manager", "Demand Generation Manager", "Paid Social Strategist"],
+    "engineering": ["Software Engineer", "Salesforce Developer", "Solutions Engineer"],
+    "data": ["Data Analyst", "Analytics Engineer", "Data Engineer"],
+    "operations": ["Revenue Operations Manager", "GTM Operations Analyst"],
+    "finance": ["Financial Analyst", "Billing Specialist"],
+    "product": ["Product Manager", "Product Marketing Manager"],
+    "people": ["Recruiter", "People Operations Partner"],
+    "legal": ["Contracts Manager"],
+}
+REMOTE_SHARE = 0.45
+UNKNOWN_REMOTE_SHARE = 0.1
+
+MONTHS = 24
+# Monthly posting volume at the end of the window relative to its start, minus 1
+GROWTH = 1.0
+
+SQLITE_SCHEMA = """
+    CREATE TABLE jobs (
+        id INTEGER PRIMARY KEY,
+        title TEXT,
+        company_name_normalized TEXT,
+        company_stage TEXT,
+        seniority_tier TEXT,
+        function_category TEXT,
+        is_remote INTEGER,
+        annual_salary_min REAL,
+        annual_salary_max REAL,
+        date_posted TEXT
+    );
+    CREATE TABLE job_tools (
+        job_id INTEGER NOT NULL,
+        tool_name TEXT,
+        tool_category TEXT
+    );
+"""
+POSTGRES_SCHEMA = """
+    CREATE TABLE jobs (
+        id bigint PRIMARY KEY,
+        title text,
+        company_name_normalized text,
+        company_stage text,
+        seniority_tier text,
+        function_category text,
+        is_remote boolean,
+        annual_salary_min numeric,
+        annual_salary_max numeric,
+        date_posted timestamp
+    );
+    CREATE TABLE job_tools (
+        job_id bigint NOT NULL,
+        tool_name text,
+        tool_category text
+    );
+"""
+INDEX_SQL = "CREATE INDEX idx_job_tools_job_id ON job_tools (job_id)"
+
+
+def parse_size(value):
+    """Job count from a preset (10k, 1m, 10m) or a plain number."""
+    if value.lower() in SIZES:
+        return SIZES[value.lower()]
+    try:
+        return int(value.replace("_", ""))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(SIZES)} or a number of jobs")
+
+
+def load_tools(count):
+    """(tool_name, db_category) for count site tools, most mentioned first.
+
+    Real tools from data/tools.json come first; the rest are "Tool N" spread
+    over the site's db categories.
+    """
+    tools = []
+    path = OUTPUT_DIR / "tools.json"
+    if path.exists():
+        with open(path) as f:
+            tools = [(t["name"], t["db_category"]) for t in json.load(f)["tools"] if t.get("db_category")]
+    tools = tools[:count]
+    for i in range(len(tools), count):
+        tools.append((f"Tool {i + 1}", SITE_DB_CATEGORIES[i % len(SITE_DB_CATEGORIES)]))
+    return tools
+
+
+def monthly_tool_weights(rng, tools, months):
+    """Cumulative pick weights of tools + EXCLUDED_TOOLS for each month of the window."""
+    base = [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(tools))]
+    scale = (1 - EXCLUDED_SHARE) / sum(base)
+    base = [w * scale for w in base] + [EXCLUDED_SHARE / len(EXCLUDED_TOOLS)] * len(EXCLUDED_TOOLS)
+    drift = [rng.gauss(0, DRIFT) for _ in tools] + [0.0] * len(EXCLUDED_TOOLS)
+
+    weights = []
+    for month in range(months):
+        position = month / (months - 1) - 0.5 if months > 1 else 0.0
+        weights.append(cumulative(w * math.exp(d * position) for w, d in zip(base, drift)))
+    return weights
+
+
+def poisson(rng, mean):
+    """Knuth's method; fine for the small means of tools per job."""
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def cumulative(weights):
+    total, result = 0.0, []
+    for w in weights:
+        total += w
+        result.append(total)
+    return result
+
+
+def generate(jobs, tool_count, tools_per_job, months=MONTHS, seed=0, today=None):
+    """Yield ([job row], [job_tools row]) batches of BATCH_JOBS jobs, in id order.
+
+    Job rows are (id, title, company, stage, seniority, function, is_remote,
+    salary_min, salary_max, date_posted as 'YYYY-MM-DD HH:MM:SS').
+    """
+    rng = random.Random(seed)
+    today = today or datetime.now().replace(microsecond=0)
+    start = today - timedelta(days=months * 365.25 / 12)
+    span = (today - start).total_seconds()
+
+    tools = load_tools(tool_count) + EXCLUDED_TOOLS
+    tool_weights = monthly_tool_weights(rng, tools[:tool_count], months)
+
+    company_count = max(1, jobs // JOBS_PER_COMPANY)
+    company_weights = cumulative(1 / (rank + 1) for rank in range(company_count))
+    company_stages = rng.choices(list(COMPANY_STAGES), weights=list(COMPANY_STAGES.values()), k=company_count)
+
+    for first in range(0, jobs, BATCH_JOBS):
+        n = min(BATCH_JOBS, jobs - first)
+        companies = rng.choices(range(company_count), cum_weights=company_weights, k=n)
+        seniorities = rng.choices(list(SENIORITY), weights=list(SENIORITY.values()), k=n)
+        functions = rng.choices(list(FUNCTIONS), weights=list(FUNCTIONS.values()), k=n)
+
+        job_rows, tool_rows = [], []
+        for i in range(n):
+            job_id = first + i + 1
+            # Inverse CDF of a density growing linearly by GROWTH over the window
+            u = (first + i + rng.random()) / jobs
+            t = (math.sqrt(1 + (2 * GROWTH + GROWTH ** 2) * u) - 1) / GROWTH if GROWTH else u
+            posted = start + timedelta(seconds=int(t * span))
+            month = min(int(t * months), months - 1)
+
+            company = None if rng.random() < NO_COMPANY_SHARE else companies[i]
+            seniority, function = seniorities[i], functions[i]
+            title = SENIORITY_TITLES.get(seniority, "") + rng.choice(ROLES[function])
+
+            salary_min = salary_max = None
+            draw = rng.random()
+            if draw < HOURLY_SHARE:
+                salary_min = round(rng.uniform(15000, 30000))
+            elif draw < SALARY_SHARE:
+                mid = MEDIAN_SALARY[seniority] * math.exp(rng.gauss(0, SALARY_SIGMA))
+                salary_min, salary_max = round(mid * 0.85, -3), round(mid * 1.15, -3)
+
+            draw = rng.random()
+            remote = None if draw < UNKNOWN_REMOTE_SHARE else draw < UNKNOWN_REMOTE_SHARE + REMOTE_SHARE
+
+            job_rows.append((
+                job_id,
+                title,
+                f"company {company}" if company is not None else None,
+                company_stages[company] if company is not None else None,
+                seniority,
+                function,
+                remote,
+                salary_min,
+                salary_max,
+                posted.strftime("%Y-%m-%d %H:%M:%S"),
+            ))
+            mentions = poisson(rng, tools_per_job)
+            if mentions:
+                picks = rng.choices(tools, cum_weights=tool_weights[month], k=mentions)
+                tool_rows.extend((job_id, name, category) for name, category in dict.fromkeys(picks))
+        yield job_rows, tool_rows
+
+
+def write_sqlite(path, batches):
+    """Create path with the jobs/job_tools tables and load the batches. Returns (jobs, rows)."""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SQLITE_SCHEMA)
+        jobs = rows = 0
+        for job_rows, tool_rows in batches:
+            conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", job_rows)
+            conn.executemany("INSERT INTO job_tools VALUES (?, ?, ?)", tool_rows)
+            jobs, rows = jobs + len(job_rows), rows + len(tool_rows)
+            report_progress(jobs, rows)
+        conn.execute(INDEX_SQL)
+        conn.commit()
+        return jobs, rows
+    finally:
+        conn.close()
+
+
+def write_postgres(db_url, batches):
+    """Create the jobs/job_tools tables (they must not exist) and COPY the batches in."""
+    conn = psycopg2.connect(db_url)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(POSTGRES_SCHEMA)
+        jobs = rows = 0
+        for job_rows, tool_rows in batches:
+            for table, batch in (("jobs", job_rows), ("job_tools", tool_rows)):
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(batch)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table} FROM STDIN WITH (FORMAT csv)", buffer)
+            jobs, rows = jobs + len(job_rows), rows + len(tool_rows)
+            report_progress(jobs, rows)
+        cursor.execute(INDEX_SQL)
+        conn.commit()
+        conn.autocommit = True
+        cursor.execute("ANALYZE jobs")
+        cursor.execute("ANALYZE job_tools")
+        return jobs, rows
+    finally:
+        conn.close()
+
+
+def report_progress(jobs, rows):
+    if jobs % 1_000_000 < BATCH_JOBS:
+        print(f"  → {jobs:,} jobs, {rows:,} tool mentions")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic jobs/job_tools data for benchmarking")
+    parser.add_argument("path", nargs="?", help="SQLite file to create (omit with --db)")
+    parser.add_argument("--db", help="Load into this (empty) Postgres database instead of a SQLite file")
+    parser.add_argument("--jobs", type=parse_size, default=SIZES["10k"],
+                        help=f"Jobs to generate: {', '.join(SIZES)} or a number (default: 10k)")
+    parser.add_argument("--tools", type=int, default=150, help="Site tools mentioned (default: 150)")
+    parser.add_argument("--tools-per-job", type=float, default=2.5,
+                        help="Mean tool mentions per job (default: 2.5)")
+    parser.add_argument("--months", type=int, default=MONTHS,
+                        help=f"Months of postings up to today (default: {MONTHS})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    if (args.path is None) == (args.db is None):
+        parser.error("give either a SQLite path or --db")
+    if args.path is not None and Path(args.path).exists():
+        parser.error(f"{args.path} already exists")
+    if args.tools < 1 or args.tools_per_job <= 0 or args.months < 1:
+        parser.error("--tools, --tools-per-job and --months must be positive")
+    return args
+
+
+def main():
+    args = parse_args()
+    target = args.path or (args.db.split("@")[-1] if "@" in args.db else args.db)
+    print(f"Generating {args.jobs:,} jobs over {args.months} months, {args.tools} tools, "
+          f"{args.tools_per_job:g} tools per job on average → {target}")
+
+    batches = generate(args.jobs, args.tools, args.tools_per_job, args.months, args.seed)
+    if args.db:
+        try:
+            jobs, rows = write_postgres(args.db, batches)
+        except psycopg2.errors.DuplicateTable:
+            print("ERROR: jobs/job_tools already exist there; generate into an empty database")
+            sys.exit(1)
+    else:
+        Path(args.path).parent.mkdir(parents=True, exist_ok=True)
+        jobs, rows = write_sqlite(args.path, batches)
+    print(f"Done: {jobs:,} jobs, {rows:,} tool mentions ({rows / jobs:.2f} per job).")
+
+
+if __name__ == "__main__":
+    main()
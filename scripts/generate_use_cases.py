@@ -6,6 +6,8 @@ import json
 import sys
 from datetime import date
 
+import tool_registry
+
 DATA = "/Users/rome/Documents/projects/datastackguide/data"
 TODAY = date.today().isoformat()
 
@@ -22,7 +24,7 @@ def save(name, data):
 
 def get_tool_meta(slug, tc, tools_meta):
     """Get display name and job count for a tool."""
-    name = tc.get(slug, {}).get('display_name', slug)
+    name = tool_registry.display_name(slug)
     jobs = tools_meta.get(slug, {}).get('job_count', 0)
     return name, jobs
 
@@ -2,8 +2,9 @@
 """
 generate_weekly_email.py — Weekly email generator for Data Stack Weekly.
 
-Reads data from data/*.json, computes week-over-week changes,
-generates an HTML email, and sends via Resend API.
+Reads data from data/*.json, computes week-over-week changes from the
+weekly series in trend_cube.json, generates an HTML email, and sends via
+Resend API.
 
 Usage:
     python3 scripts/generate_weekly_email.py              # Preview only (prints HTML)
@@ -12,16 +13,21 @@ Usage:
 """
 
 import json
+import math
 import os
 import sys
 import argparse
 from datetime import datetime
 from pathlib import Path
 
+import tool_registry
+
 # Resolve project root (parent of scripts/)
 ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "data"
 SNAPSHOT_PATH = DATA_DIR / "previous_market_snapshot.json"
+# Pairs need at least this many co-mentions to be featured as a stack combo
+MIN_PAIR_POSTS = 10
 
 # Shared inline styles
 S_MONO = "font-family:'Space Mono',monospace;"
@@ -34,7 +40,10 @@ S_PILL = "display:inline-block;padding:4px 10px;background:rgba(20,184,166,0.1);
 
 
 def load_json(filename):
-    with open(DATA_DIR / filename) as f:
+    path = DATA_DIR / filename
+    if not path.exists():
+        sys.exit(f"data/{filename} not found; run scripts/extract_data.py first")
+    with open(path) as f:
         return json.load(f)
 
 
@@ -51,13 +60,33 @@ def save_snapshot(current_data):
     print(f"Snapshot saved to {SNAPSHOT_PATH}")
 
 
-def tool_display_name(slug):
-    return " ".join(w.capitalize() for w in slug.split("-"))
+def weekly_mentions(cube):
+    """Last two complete weeks of trend_cube.json.
+
+    Returns (week start, tools by mentions that week, {slug: mentions the week before}),
+    or None when the cube has fewer than two weeks or none posted in the last one.
+    """
+    weeks = cube.get("weeks", [])
+    if len(weeks) < 2:
+        return None
+    latest, prev_lookup = [], {}
+    for slug, row in cube["slugs"].items():
+        series = cube["weekly"][row]
+        prev_lookup[slug] = series[-2]
+        if series[-1] > 0:
+            latest.append({"tool": cube["tools"][row], "slug": slug, "mentions": series[-1]})
+    if not latest:
+        return None
+    latest.sort(key=lambda t: t["mentions"], reverse=True)
+    return weeks[-1], latest, prev_lookup
 
 
 def build_email_data():
     market = load_json("market_signals.json")
     trends = load_json("trends.json")
+    cube = load_json("trend_cube.json")
+    momentum = load_json("momentum.json")
+    companies = load_json("companies.json")
     cooccurrence = load_json("cooccurrence.json")
     tool_details = load_json("tool_details.json")
     tool_content = load_json("tool_content.json")
@@ -68,17 +97,25 @@ def build_email_data():
     latest_month = months[0]
     latest_data = trends["trends"][latest_month]
 
-    # Load previous snapshot for week-over-week comparison
+    # Week over week from the trend cube's weekly series
+    weekly = weekly_mentions(cube)
     prev_snapshot = load_previous_snapshot()
-    if prev_snapshot and "top_tools" in prev_snapshot:
+    if weekly is not None:
+        latest_week, latest_data, prev_lookup = weekly
+        # Same reliability check as the monthly fallback below
+        has_prev = sum(prev_lookup.values()) >= sum(t["mentions"] for t in latest_data) * 0.5
+        period_label = f"Week of {datetime.fromisoformat(latest_week):%b %-d} vs the week before"
+    elif prev_snapshot and "top_tools" in prev_snapshot:
         prev_lookup = {t["slug"]: t["mentions"] for t in prev_snapshot["top_tools"]}
         has_prev = True
+        period_label = "This month vs the last saved snapshot"
     else:
         # Fallback: compare months from trends.json (with reliability check)
         prev_month = months[1] if len(months) > 1 else None
         prev_data = trends["trends"][prev_month] if prev_month else []
         prev_lookup = {t["slug"]: t["mentions"] for t in prev_data}
         has_prev = len(prev_data) >= len(latest_data) * 0.5
+        period_label = "This month vs last month"
 
     # Top 10 tools with trend
     top_tools = []
@@ -96,37 +133,39 @@ def build_email_data():
             "change": change,
         })
 
-    # Fastest growers (only when previous data is available)
-    growers = []
-    if has_prev:
-        for t in latest_data:
-            if t["mentions"] > 10 and t["slug"] in prev_lookup and prev_lookup[t["slug"]] > 0:
-                prev_val = prev_lookup[t["slug"]]
-                change = round(((t["mentions"] - prev_val) / prev_val) * 100)
-                if change > 20:
-                    growers.append({
-                        "name": t["tool"],
-                        "slug": t["slug"],
-                        "mentions": t["mentions"],
-                        "prev": prev_val,
-                        "change": change,
-                    })
-        growers.sort(key=lambda x: x["change"], reverse=True)
-
-    # Top 5 cooccurrence pairs (deduplicated)
+    # Fastest growers by momentum.json's growth score, which already shrinks
+    # growth on small counts toward zero, so no mention/percent cutoffs here
+    growers = [
+        {
+            "name": t["tool"],
+            "slug": t["slug"],
+            "mentions": t["recent"],
+            "prev": t["previous"],
+            "change": round(math.expm1(t["growth_score"]) * 100),
+        }
+        for t in momentum["tools"]
+        if t["growth_score"] > 0
+    ]
+
+    # Top 5 cooccurrence pairs (deduplicated), strongest association first.
+    # Raw counts favor pairs of the most-posted tools; lift compares each
+    # pair against how often it would appear together by chance.
     all_pairs = []
     seen = set()
     for key, pairs in cooccurrence.get("cooccurrence", {}).items():
-        for p in pairs[:3]:
+        for p in pairs:
+            if p["count"] < MIN_PAIR_POSTS:
+                continue
             pair_key = tuple(sorted([key, p["slug"]]))
             if pair_key not in seen:
                 seen.add(pair_key)
                 all_pairs.append({
-                    "tool_a": tool_display_name(key),
+                    "tool_a": tool_registry.display_name(key),
                     "tool_b": p["tool"],
                     "count": p["count"],
+                    "lift": p.get("lift", 0),
                 })
-    all_pairs.sort(key=lambda x: x["count"], reverse=True)
+    all_pairs.sort(key=lambda x: (x["lift"], x["count"]), reverse=True)
 
     # Seniority breakdown for top tool
     top_slug = top_tools[0]["slug"] if top_tools else "salesforce"
@@ -158,13 +197,8 @@ def build_email_data():
                 "onsite": onsite,
             })
 
-    # Top hiring companies across all tools
-    all_companies = {}
-    for slug, d in tool_details["details"].items():
-        for comp in d.get("top_companies", []):
-            name = comp["name"].title()
-            all_companies[name] = all_companies.get(name, 0) + comp["jobs"]
-    top_companies = sorted(all_companies.items(), key=lambda x: x[1], reverse=True)[:8]
+    # Top hiring companies: distinct postings mentioning any tracked tool
+    top_companies = [(c["name"].title(), c["jobs"]) for c in companies["companies"][:8]]
 
     # Pricing spotlight — pick a popular tool with pricing tiers
     pricing_spotlight = None
@@ -173,7 +207,7 @@ def build_email_data():
         tiers = tc.get("pricing", {}).get("tiers", [])
         if len(tiers) >= 2:
             pricing_spotlight = {
-                "name": tc.get("display_name", t["name"]),
+                "name": tool_registry.display_name(t["slug"]),
                 "slug": t["slug"],
                 "tiers": tiers[:4],
                 "notes": tc.get("pricing", {}).get("notes", ""),
@@ -202,6 +236,7 @@ def build_email_data():
         "total_companies": market["total_companies"],
         "top_tools": top_tools,
         "growers": growers[:3],
+        "growth_window": momentum["window_weeks"],
         "top_pairs": all_pairs[:5],
         "seniority": seniority_tiers,
         "seniority_total": seniority_total,
@@ -211,6 +246,7 @@ def build_email_data():
         "pricing_spotlight": pricing_spotlight,
         "categories": cat_data[:8],
         "formatted_month": formatted_month,
+        "period_label": period_label,
         "generated_at": datetime.now().isoformat(),
     }
 
@@ -269,6 +305,7 @@ def generate_html(data):
         growers_html = f'''<tr><td style="{S_SECTION_PAD}{S_DIVIDER}">
           <h3 style="{S_SECTION_TITLE}">🚀 Biggest Movers</h3>
           {grower_cards}
+          <div style="font-size:11px;color:#475569;margin-top:8px;">Last {data["growth_window"]} weeks vs the {data["growth_window"]} before, adjusted for small counts</div>
         </td></tr>'''
 
     # ── Section 3: Who's Hiring — Seniority Breakdown ──
@@ -363,11 +400,11 @@ def generate_html(data):
             <span style="color:#64748b;margin:0 4px;font-size:12px;">+</span>
             <span style="{S_PILL}">{pair["tool_b"]}</span>
           </td>
-          <td style="padding:10px 0;{border}{S_MONO}font-size:13px;color:#94a3b8;text-align:right;white-space:nowrap;">{pair["count"]} posts</td>
+          <td style="padding:10px 0;{border}{S_MONO}font-size:13px;color:#94a3b8;text-align:right;white-space:nowrap;">{pair["count"]} posts · {pair["lift"]:.1f}× lift</td>
         </tr>'''
 
     stacks_html = f'''<tr><td style="{S_SECTION_PAD}{S_DIVIDER}">
-      <h3 style="{S_SECTION_TITLE}">🔗 Most Common Stack Combos</h3>
+      <h3 style="{S_SECTION_TITLE}">🔗 Strongest Stack Combos</h3>
       <div style="{S_CARD}">
         <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
           {pair_cards}
@@ -445,6 +482,7 @@ def generate_html(data):
             </tr>
             {tool_rows}
           </table>
+          <div style="font-size:11px;color:#475569;margin-top:8px;">{data["period_label"]}</div>
         </td></tr>
 
         {growers_html}
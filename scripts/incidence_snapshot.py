@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+incidence_snapshot.py — Local columnar snapshot of the job/tool incidence.
+
+Pulls every job_tools row joined with its job once via COPY (or one query of a
+SQLite copy of the jobs/job_tools tables) and stores it as dictionary-encoded
+integer columns on disk. Columns are memory-mapped on load,
+and the aggregation functions below compute the same result sets as the SQL
+in extract_data.py, so repeated extractions run locally.
+
+Layout of a snapshot directory:
+    manifest.json           row counts, totals, watermark, column typecodes
+    dict_<name>.json        string dictionary per encoded column
+    jobs.<column>.bin       one value per job (jobs that mention any tool)
+    incidence.<column>.bin  one value per job_tools row, grouped by job
+
+jobs.row_start holds len(jobs) + 1 offsets into the incidence columns
+(CSR layout): job i owns incidence rows row_start[i]:row_start[i + 1].
+
+Used by extract_data.py (--snapshot / --from-snapshot / --db sqlite:///...) and
+benchmark_extraction.py; not run directly.
+"""
+
+import csv
+import json
+import mmap
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / ".extract_cache" / "snapshot"
+
+# Dictionary-encoded string columns; NULL is stored as -1
+DICTIONARIES = ["tool", "category", "company", "stage", "seniority", "function", "title"]
+
+JOB_COLUMNS = {
+    "job_id": "q",
+    "company": "i",
+    "stage": "i",
+    "seniority": "i",
+    "function": "i",
+    "title": "i",
+    "remote": "b",       # 1 remote, 0 onsite, -1 NULL
+    "salary_min": "i",   # 0 when NULL
+    "salary_max": "i",
+    "posted": "q",       # epoch seconds, -1 when NULL
+    "row_start": "q",
+}
+INCIDENCE_COLUMNS = {
+    "tool": "i",
+    "category": "i",
+}
+
+# Column order of the COPY below
+COPY_SQL = """
+    COPY (
+        SELECT
+            j.id,
+            jt.tool_name,
+            jt.tool_category,
+            j.company_name_normalized,
+            j.company_stage,
+            j.seniority_tier,
+            j.function_category,
+            j.is_remote,
+            ROUND(j.annual_salary_min),
+            ROUND(j.annual_salary_max),
+            EXTRACT(EPOCH FROM j.date_posted)::bigint,
+            j.title
+        FROM job_tools jt
+        JOIN jobs j ON jt.job_id = j.id
+        ORDER BY j.id
+    ) TO STDOUT WITH (FORMAT csv, NULL '\\N')
+"""
+NULL = "\\N"
+
+# The same rows from a SQLite file, with NULLs spelled as in the COPY. date_posted
+# is stored as ISO text ('YYYY-MM-DD HH:MM:SS', UTC) and is_remote as 0/1.
+SQLITE_SQL = """
+    SELECT
+        j.id,
+        COALESCE(jt.tool_name, '\\N'),
+        COALESCE(jt.tool_category, '\\N'),
+        COALESCE(j.company_name_normalized, '\\N'),
+        COALESCE(j.company_stage, '\\N'),
+        COALESCE(j.seniority_tier, '\\N'),
+        COALESCE(j.function_category, '\\N'),
+        CASE j.is_remote WHEN 1 THEN 't' WHEN 0 THEN 'f' ELSE '\\N' END,
+        COALESCE(CAST(ROUND(j.annual_salary_min) AS INTEGER), '\\N'),
+        COALESCE(CAST(ROUND(j.annual_salary_max) AS INTEGER), '\\N'),
+        COALESCE(CAST(strftime('%s', j.date_posted) AS INTEGER), '\\N'),
+        COALESCE(j.title, '\\N')
+    FROM job_tools jt
+    JOIN jobs j ON jt.job_id = j.id
+    ORDER BY j.id
+"""
+
+# Salaries at or below this are treated as hourly/noise, as in extract_tools()
+MIN_ANNUAL_SALARY = 30000
+
+
+# ── Pull ──
+
+def pull_snapshot(conn, totals, directory=SNAPSHOT_DIR):
+    """Pull the incidence with one COPY and write it as columnar files.
+
+    totals is the {"total_jobs", "total_companies", "watermark"} dict read in
+    the same transaction; it is stored in the manifest.
+    """
+    # COPY streams to a temp file so the CSV parser never holds the result set
+    with tempfile.TemporaryFile("w+", newline="") as f:
+        conn.cursor().copy_expert(COPY_SQL, f)
+        f.seek(0)
+        return write_snapshot(csv.reader(f), totals, directory)
+
+
+def pull_sqlite_snapshot(path, directory=SNAPSHOT_DIR):
+    """Pull the incidence from a SQLite file with the jobs/job_tools tables.
+
+    Totals are read from the same file, so the snapshot stands in for one
+    pulled from Postgres; see generate_synthetic_jobs.py for the schema.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT company_name_normalized),
+                COALESCE(MAX(id), 0),
+                strftime('%Y-%m-%dT%H:%M:%S', MAX(date_posted))
+            FROM jobs
+        """)
+        total_jobs, total_companies, max_id, max_date = cursor.fetchone()
+        totals = {
+            "total_jobs": total_jobs,
+            "total_companies": total_companies,
+            "watermark": {"max_job_id": max_id, "max_date_posted": max_date},
+        }
+        return write_snapshot(conn.execute(SQLITE_SQL), totals, directory)
+    finally:
+        conn.close()
+
+
+def write_snapshot(rows, totals, directory=SNAPSHOT_DIR):
+    """Write incidence rows (the COPY's columns, NULL as \\N, grouped by job) as columnar files.
+
+    The files are written to a sibling temp directory that then replaces
+    directory, so a failed pull leaves the previous snapshot intact and a
+    reader never sees old and new columns mixed (nor a mapped column
+    truncated under it).
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+    try:
+        manifest = _write_columns(rows, totals, staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # A directory can't be renamed over a non-empty one: move the old one aside first
+    previous = None
+    if directory.exists():
+        previous = Path(tempfile.mkdtemp(prefix=f".{directory.name}.old.", dir=directory.parent))
+        os.replace(directory, previous / directory.name)
+    os.replace(staging, directory)
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def _write_columns(rows, totals, directory):
+    codes = {name: {} for name in DICTIONARIES}
+    jobs = {name: array(typecode) for name, typecode in JOB_COLUMNS.items()}
+    incidence = {name: array(typecode) for name, typecode in INCIDENCE_COLUMNS.items()}
+
+    def encode(name, value):
+        if value == NULL:
+            return -1
+        return codes[name].setdefault(value, len(codes[name]))
+
+    last_job = None
+    for row in rows:
+        (job_id, tool, category, company, stage, seniority, function,
+         remote, salary_min, salary_max, posted, title) = row
+        if job_id != last_job:
+            last_job = job_id
+            jobs["job_id"].append(int(job_id))
+            jobs["company"].append(encode("company", company))
+            jobs["stage"].append(encode("stage", stage))
+            jobs["seniority"].append(encode("seniority", seniority))
+            jobs["function"].append(encode("function", function))
+            jobs["title"].append(encode("title", title))
+            jobs["remote"].append({"t": 1, "f": 0}.get(remote, -1))
+            jobs["salary_min"].append(0 if salary_min == NULL else int(salary_min))
+            jobs["salary_max"].append(0 if salary_max == NULL else int(salary_max))
+            jobs["posted"].append(-1 if posted == NULL else int(posted))
+            jobs["row_start"].append(len(incidence["tool"]))
+        incidence["tool"].append(encode("tool", tool))
+        incidence["category"].append(encode("category", category))
+    jobs["row_start"].append(len(incidence["tool"]))
+
+    for table, columns in (("jobs", jobs), ("incidence", incidence)):
+        for name, values in columns.items():
+            with open(directory / f"{table}.{name}.bin", "wb") as out:
+                values.tofile(out)
+    for name, mapping in codes.items():
+        with open(directory / f"dict_{name}.json", "w") as out:
+            json.dump(list(mapping), out)
+
+    manifest = {
+        "created_at": datetime.now().isoformat(),
+        **totals,
+        "jobs": len(jobs["job_id"]),
+        "rows": len(incidence["tool"]),
+        "byteorder": sys.byteorder,
+        "columns": {"jobs": JOB_COLUMNS, "incidence": INCIDENCE_COLUMNS},
+    }
+    with open(directory / "manifest.json", "w") as out:
+        json.dump(manifest, out, indent=2)
+    return manifest
+
+
+# ── Load ──
+
+def _map_column(path, typecode):
+    """Memory-map a column file as a read-only typed memoryview."""
+    if os.path.getsize(path) == 0:
+        return memoryview(array(typecode))
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+def load_snapshot(directory=SNAPSHOT_DIR):
+    """Load a snapshot: manifest, string dictionaries and memory-mapped columns."""
+    directory = Path(directory)
+    with open(directory / "manifest.json") as f:
+        manifest = json.load(f)
+    if manifest["byteorder"] != sys.byteorder:
+        raise ValueError(f"{directory} was written on a {manifest['byteorder']}-endian machine")
+
+    snapshot = {"manifest": manifest, "dictionaries": {}}
+    for name in DICTIONARIES:
+        with open(directory / f"dict_{name}.json") as f:
+            snapshot["dictionaries"][name] = json.load(f)
+    for table, columns in manifest["columns"].items():
+        snapshot[table] = {
+            name: _map_column(directory / f"{table}.{name}.bin", typecode)
+            for name, typecode in columns.items()
+        }
+    return snapshot
+
+
+def _decode(snapshot, name, code):
+    return None if code < 0 else snapshot["dictionaries"][name][code]
+
+
+def _category_mask(snapshot, excluded_categories):
+    """Per category code: True when rows of that category count."""
+    return [c not in excluded_categories for c in snapshot["dictionaries"]["category"]]
+
+
+def _tool_codes(snapshot, tool_names):
+    wanted = set(tool_names)
+    return {code for code, name in enumerate(snapshot["dictionaries"]["tool"]) if name in wanted}
+
+
+# ── Aggregations ──
+# Each returns the rows of the matching query in extract_data.py.
+
+def tool_stats(snapshot, excluded_categories, site_categories=None):
+    """Rows of extract_tools(): (tool_name, db_category, job_count, unique_companies,
+    salary_min_sum, salary_min_count, salary_max_sum, salary_max_count), ordered
+    by job_count descending, then by name.
+
+    When site_categories is given, only rows of those db categories count,
+    like the site-category join in extract_tools()."""
+    jobs, inc = snapshot["jobs"], snapshot["incidence"]
+    row_start, company = jobs["row_start"], jobs["company"]
+    salary_min, salary_max = jobs["salary_min"], jobs["salary_max"]
+    tools, categories = inc["tool"], inc["category"]
+    counted = _category_mask(snapshot, excluded_categories)
+    if site_categories is not None:
+        wanted = set(site_categories)
+        counted = [ok and name in wanted for ok, name in zip(counted, snapshot["dictionaries"]["category"])]
+
+    job_counts = Counter()
+    companies = defaultdict(set)
+    salary_sums = defaultdict(lambda: [0, 0, 0, 0])
+    for i in range(len(jobs["job_id"])):
+        seen = set()
+        for r in range(row_start[i], row_start[i + 1]):
+            if not counted[categories[r]]:
+                continue
+            key = (tools[r], categories[r])
+            if key not in seen:
+                seen.add(key)
+                job_counts[key] += 1
+                if company[i] >= 0:
+                    companies[key].add(company[i])
+            # AVG() runs over joined rows, so duplicates count again
+            sums = salary_sums[key]
+            if salary_min[i] > MIN_ANNUAL_SALARY:
+                sums[0] += salary_min[i]
+                sums[1] += 1
+            if salary_max[i] > MIN_ANNUAL_SALARY:
+                sums[2] += salary_max[i]
+                sums[3] += 1
+
+    rows = []
+    for (tool, category), job_count in job_counts.most_common():
+        sums = salary_sums[(tool, category)]
+        rows.append((
+            _decode(snapshot, "tool", tool),
+            _decode(snapshot, "category", category),
+            job_count,
+            len(companies[(tool, category)]),
+            *sums,
+        ))
+    rows.sort(key=lambda row: (-row[2], row[0], row[1]))
+    return rows
+
+
+def job_tool_rows(snapshot, excluded_categories):
+    """Rows of extract_incidence(): (job_id, tool_name), grouped by job."""
+    jobs, inc = snapshot["jobs"], snapshot["incidence"]
+    job_ids, row_start = jobs["job_id"], jobs["row_start"]
+    tools, categories = inc["tool"], inc["category"]
+    counted = _category_mask(snapshot, excluded_categories)
+    names = snapshot["dictionaries"]["tool"]
+
+    for i in range(len(job_ids)):
+        for r in range(row_start[i], row_start[i + 1]):
+            if counted[categories[r]]:
+                yield job_ids[i], names[tools[r]]
+
+
+def monthly_mentions(snapshot, excluded_categories, since, min_mentions):
+    """Rows of extract_trends(): (month, tool_name, mentions) for postings at or
+    after since (an aware datetime), ordered by month and mentions descending."""
+    jobs, inc = snapshot["jobs"], snapshot["incidence"]
+    row_start, posted = jobs["row_start"], jobs["posted"]
+    tools, categories = inc["tool"], inc["category"]
+    counted = _category_mask(snapshot, excluded_categories)
+    since_epoch = int(since.timestamp())
+
+    counts = Counter()
+    for i in range(len(jobs["job_id"])):
+        if posted[i] < since_epoch:
+            continue
+        month = datetime.fromtimestamp(posted[i], timezone.utc).strftime("%Y-%m")
+        for r in range(row_start[i], row_start[i + 1]):
+            if counted[categories[r]]:
+                counts[(month, tools[r])] += 1
+
+    rows = [
+        (month, _decode(snapshot, "tool", tool), mentions)
+        for (month, tool), mentions in counts.items()
+        if mentions >= min_mentions
+    ]
+    rows.sort(key=lambda row: (row[0], row[2]), reverse=True)
+    return rows
+
+
+def daily_mentions(snapshot, excluded_categories, since):
+    """Rows of extract_daily_mentions(): (day, tool_name, mentions) for postings
+    on or after since (a date)."""
+    jobs, inc = snapshot["jobs"], snapshot["incidence"]
+    row_start, posted = jobs["row_start"], jobs["posted"]
+    tools, categories = inc["tool"], inc["category"]
+    counted = _category_mask(snapshot, excluded_categories)
+    since_epoch = int(datetime(since.year, since.month, since.day, tzinfo=timezone.utc).timestamp())
+
+    counts = Counter()
+    for i in range(len(jobs["job_id"])):
+        if posted[i] < since_epoch:
+            continue
+        day = datetime.fromtimestamp(posted[i], timezone.utc).date()
+        for r in range(row_start[i], row_start[i + 1]):
+            if counted[categories[r]]:
+                counts[(day, tools[r])] += 1
+
+    for (day, tool), mentions in counts.items():
+        yield day, _decode(snapshot, "tool", tool), mentions
+
+
+def salary_rows(snapshot, site_categories):
+    """Rows of extract_salary_sketches(): (job_id, tool_name, db_category,
+    company_stage, seniority_tier, function_category, salary_min, salary_max)
+    for salary-reporting jobs, one per row of a site db category, grouped by job."""
+    jobs, inc = snapshot["jobs"], snapshot["incidence"]
+    job_ids, row_start = jobs["job_id"], jobs["row_start"]
+    salary_min, salary_max = jobs["salary_min"], jobs["salary_max"]
+    tools, categories = inc["tool"], inc["category"]
+    wanted = set(site_categories)
+    counted = [name in wanted for name in snapshot["dictionaries"]["category"]]
+
+    for i in range(len(job_ids)):
+        if salary_min[i] <= MIN_ANNUAL_SALARY and salary_max[i] <= MIN_ANNUAL_SALARY:
+            continue
+        job = (
+            _decode(snapshot, "stage", jobs["stage"][i]),
+            _decode(snapshot, "seniority", jobs["seniority"][i]),
+            _decode(snapshot, "function", jobs["function"][i]),
+            salary_min[i] or None,
+            salary_max[i] or None,
+        )
+        for r in range(row_start[i], row_start[i + 1]):
+            if counted[categories[r]]:
+                yield (job_ids[i], _decode(snapshot, "tool", tools[r]), _decode(snapshot, "category", categories[r])) + job
+
+
+def company_rows(snapshot, site_categories):
+    """Rows of extract_company_rows(): (company, tool_name, jobs) per company and
+    site tool, plus (company, None, jobs) with each company's distinct jobs."""
+    jobs, inc = snapshot["jobs"], snapshot["incidence"]
+    row_start, company = jobs["row_start"], jobs["company"]
+    tools, categories = inc["tool"], inc["category"]
+    wanted = set(site_categories)
+    counted = [name in wanted for name in snapshot["dictionaries"]["category"]]
+
+    counts = Counter()
+    for i in range(len(jobs["job_id"])):
+        if company[i] < 0:
+            continue
+        distinct = {tools[r] for r in range(row_start[i], row_start[i + 1]) if counted[categories[r]]}
+        if distinct:
+            counts[(company[i], -1)] += 1
+            for tool in distinct:
+                counts[(company[i], tool)] += 1
+
+    for (code, tool), count in counts.items():
+        yield _decode(snapshot, "company", code), _decode(snapshot, "tool", tool), count
+
+
+def _tool_jobs(snapshot, tool_names):
+    """Yield (job_index, distinct tool codes, row tool codes) for jobs mentioning tool_names."""
+    jobs, tools = snapshot["jobs"], snapshot["incidence"]["tool"]
+    row_start = jobs["row_start"]
+    wanted = _tool_codes(snapshot, tool_names)
+    for i in range(len(jobs["job_id"])):
+        rows = [tools[r] for r in range(row_start[i], row_start[i + 1]) if tools[r] in wanted]
+        if rows:
+            yield i, set(rows), rows
+
+
+def distribution_rows(snapshot, tool_names):
+    """Rows of the details distributions query: (tool_name, column, value, distinct_jobs)
+    for column in company_stage, seniority_tier and function_category."""
+    jobs = snapshot["jobs"]
+    columns = [
+        ("company_stage", "stage", jobs["stage"]),
+        ("seniority_tier", "seniority", jobs["seniority"]),
+        ("function_category", "function", jobs["function"]),
+    ]
+    counts = Counter()
+    for i, distinct_tools, _ in _tool_jobs(snapshot, tool_names):
+        for tool in distinct_tools:
+            for column, _, values in columns:
+                counts[(tool, column, values[i])] += 1
+
+    dictionary = {column: name for column, name, _ in columns}
+    return [
+        (_decode(snapshot, "tool", tool), column, _decode(snapshot, dictionary[column], value), count)
+        for (tool, column, value), count in counts.most_common()
+    ]
+
+
+def remote_rows(snapshot, tool_names):
+    """Rows of the remote split query: (tool_name, remote, onsite), counted per joined row."""
+    remote = snapshot["jobs"]["remote"]
+    splits = defaultdict(lambda: [0, 0])
+    for i, _, rows in _tool_jobs(snapshot, tool_names):
+        for tool in rows:
+            splits[tool][0 if remote[i] == 1 else 1] += 1
+    return [(_decode(snapshot, "tool", tool), r, o) for tool, (r, o) in splits.items()]
+
+
+def top_company_rows(snapshot, tool_names, limit):
+    """Rows of the top companies query: (tool_name, company, distinct_jobs), top `limit` per tool."""
+    company = snapshot["jobs"]["company"]
+    counts = defaultdict(Counter)
+    for i, distinct_tools, _ in _tool_jobs(snapshot, tool_names):
+        if company[i] >= 0:
+            for tool in distinct_tools:
+                counts[tool][company[i]] += 1
+    return _top_rows(snapshot, counts, "company", limit)
+
+
+def top_title_rows(snapshot, tool_names, limit):
+    """Rows of the top titles query: (tool_name, title, count), counted per joined row."""
+    title = snapshot["jobs"]["title"]
+    counts = defaultdict(Counter)
+    for i, _, rows in _tool_jobs(snapshot, tool_names):
+        for tool in rows:
+            counts[tool][title[i]] += 1
+    return _top_rows(snapshot, counts, "title", limit)
+
+
+def _top_rows(snapshot, counts, dictionary, limit):
+    return [
+        (_decode(snapshot, "tool", tool), _decode(snapshot, dictionary, value), count)
+        for tool, counter in counts.items()
+        for value, count in counter.most_common(limit)
+    ]
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+index_advisor.py — Index advisor for the extract_data.py workload.
+
+Compares the indexes on the tables extract_data.py reads (pg_index,
+pg_stat_user_indexes) with the access paths of its queries, and uses the
+planner statistics (pg_class, pg_stats) to estimate what each missing index
+would save. Prints ready-to-run DDL for missing indexes worth creating, and
+for the indexes not scanned since the statistics were last reset. The DROP
+statements are commented out: a zero count only covers the time since the
+reset, which may not include a full extraction (or the other readers of the
+tables), so each is uncommented once checked.
+
+If extraction_profile.json was written with --profile --explain, the
+sequential scans seen in its plans are reported next to each access path.
+
+Usage:
+    python3 scripts/index_advisor.py
+    python3 scripts/index_advisor.py --db postgresql://user:pw@host/db
+    python3 scripts/index_advisor.py --cube-months 36   # extraction runs with --cube-months 36
+"""
+
+import argparse
+import json
+import math
+from datetime import datetime, timedelta
+
+import psycopg2
+
+from extract_data import (
+    DEFAULT_DB_URL,
+    DETAIL_CHUNK_TOOLS,
+    OUTPUT_DIR,
+    PROFILE_PATH,
+    SITE_DB_CATEGORIES,
+    TREND_CUBE_MONTHS,
+)
+
+PAGE_BYTES = 8192
+# Bytes per btree entry beyond its key columns (tuple header, item pointer)
+INDEX_ENTRY_OVERHEAD = 16
+# Leaf pages are filled to 90% by default
+INDEX_FILL = 0.9
+# Recommend an index when it reads at most this share of the pages a seq scan would
+MAX_READ_SHARE = 0.5
+# Months of postings extract_trends() reads
+TRENDS_MONTHS = 12
+
+# How the extraction reads each table. Every entry is a candidate index:
+#   columns    index key, the filtered column first
+#   estimate   share of rows a query reads through it:
+#              ("after_watermark", col)  incremental range col > last max job id
+#              ("recent", col)           col within the trends/trend cube horizon
+#              ("values", col, n)        col = ANY(n values)
+#              ("in", col, values)       col in a fixed list of values
+#              ("not_null", col)         every row where col is set
+#   covering   the queries need no other column of the table, so the index
+#              alone answers them (index-only scan, no heap pages)
+#   calls      queries per run using the path (per_detail_chunk: per chunk of tools)
+#   stages     extraction_profile.json stages whose queries use it
+ACCESS_PATTERNS = [
+    {
+        "table": "job_tools",
+        "columns": ["job_id"],
+        "estimate": ("after_watermark", "job_id"),
+        "covering": False,
+        "calls": 8,
+        "stages": ["incremental"],
+        "used_by": "--incremental: job_tools rows of jobs added since the watermark",
+    },
+    {
+        "table": "jobs",
+        "columns": ["id"],
+        "estimate": ("after_watermark", "id"),
+        "covering": True,
+        "calls": 2,
+        "stages": ["incremental"],
+        "used_by": "--incremental: counts of new jobs and companies; join key of every job_tools → jobs join",
+    },
+    {
+        "table": "job_tools",
+        "columns": ["tool_name", "job_id"],
+        "estimate": ("values", "tool_name", DETAIL_CHUNK_TOOLS),
+        "covering": True,
+        "calls": 4,
+        "per_detail_chunk": True,
+        "stages": ["details"],
+        "used_by": "per-tool details: tool_name = ANY(one chunk of tools)",
+    },
+    {
+        "table": "jobs",
+        "columns": ["date_posted"],
+        "estimate": ("recent", "date_posted"),
+        "covering": False,
+        "calls": 2,
+        "stages": ["trends", "trend_cube"],
+        "used_by": f"trends (last {TRENDS_MONTHS} months) and the trend cube (--cube-months)",
+    },
+    {
+        "table": "jobs",
+        "columns": ["company_name_normalized"],
+        "estimate": ("not_null", "company_name_normalized"),
+        "covering": True,
+        "calls": 1,
+        "stages": ["totals"],
+        "used_by": "totals: COUNT(DISTINCT company_name_normalized)",
+    },
+    {
+        "table": "job_tools",
+        "columns": ["tool_category", "tool_name", "job_id"],
+        "estimate": ("in", "tool_category", SITE_DB_CATEGORIES),
+        "covering": True,
+        "calls": 4,
+        "stages": ["tools", "incidence", "trends"],
+        "used_by": "tools, co-occurrence and stacks (two passes) and trends: site categories only",
+    },
+]
+
+
+def get_tables(conn, tables):
+    """{table: (pages, rows)} from the planner's estimates in pg_class."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.relname, c.relpages, c.reltuples
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relkind = 'r' AND c.relname = ANY(%s)
+    """, (tables,))
+    return {name: (max(pages, 1), rows) for name, pages, rows in cursor.fetchall()}
+
+
+def get_indexes(conn, tables):
+    """Indexes on the tables with their key columns, size and scan count."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT
+            t.relname,
+            i.relname,
+            array_agg(a.attname ORDER BY k.ord) FILTER (WHERE k.ord <= ix.indnkeyatts),
+            array_agg(a.attname ORDER BY k.ord),
+            ix.indisunique OR ix.indisprimary,
+            pg_relation_size(i.oid),
+            s.idx_scan,
+            pg_get_indexdef(i.oid)
+        FROM pg_index ix
+        JOIN pg_class t ON t.oid = ix.indrelid
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        CROSS JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+        LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+        LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.oid
+        WHERE n.nspname = current_schema() AND t.relname = ANY(%s)
+        GROUP BY t.relname, i.relname, ix.indisunique, ix.indisprimary, i.oid, s.idx_scan
+        ORDER BY t.relname, i.relname
+    """, (tables,))
+    return [
+        {
+            "table": table, "name": name, "key": key or [], "columns": columns,
+            "unique": unique, "bytes": size, "scans": scans, "definition": definition,
+        }
+        for table, name, key, columns, unique, size, scans, definition in cursor.fetchall()
+    ]
+
+
+def get_column_stats(conn, tables):
+    """{(table, column): pg_stats row} for the tables, arrays as text lists."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT tablename, attname, null_frac, avg_width, n_distinct, correlation,
+               most_common_vals::text::text[], most_common_freqs,
+               histogram_bounds::text::text[]
+        FROM pg_stats
+        WHERE schemaname = current_schema() AND tablename = ANY(%s)
+    """, (tables,))
+    return {
+        (row[0], row[1]): {
+            "null_frac": row[2], "avg_width": row[3], "n_distinct": row[4],
+            "correlation": row[5], "mcv": row[6] or [], "mcf": row[7] or [],
+            "histogram": row[8] or [],
+        }
+        for row in cursor.fetchall()
+    }
+
+
+def get_stats_reset(conn):
+    """When this database's statistics counters were last reset (None if never)."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def distinct_values(stats, rows):
+    """n_distinct as a count (pg_stats stores large ones as a negative share of rows)."""
+    n = stats["n_distinct"]
+    return max(-n * rows if n < 0 else n, 1)
+
+
+def share_above(bounds, value):
+    """Share of histogram buckets above value, at least one bucket."""
+    if len(bounds) < 2:
+        return 1.0
+    return max(sum(b > value for b in bounds[1:]), 1) / (len(bounds) - 1)
+
+
+def read_fraction(estimate, stats, rows, watermark, months):
+    """Share of the table's rows a query reads through the candidate index, or None if unknown.
+
+    months is the longest date window read (trends or the trend cube).
+    """
+    kind, column = estimate[0], estimate[1]
+    col = stats.get(column)
+    if col is None:
+        return None
+    present = 1 - col["null_frac"]
+
+    if kind == "after_watermark":
+        if watermark is None:
+            return None
+        bounds = [int(b) for b in col["histogram"]]
+        return present * share_above(bounds, watermark)
+    if kind == "recent":
+        cutoff = (datetime.now() - timedelta(days=30 * months)).strftime("%Y-%m-%d %H:%M:%S")
+        return present * share_above(col["histogram"], cutoff)
+    if kind == "values":
+        return min(1.0, estimate[2] / distinct_values(col, rows)) * present
+    if kind == "in":
+        frequencies = dict(zip(col["mcv"], col["mcf"]))
+        rest = max(1 - col["null_frac"] - sum(col["mcf"]), 0)
+        others = max(distinct_values(col, rows) - len(col["mcv"]), 1)
+        return min(1.0, sum(frequencies.get(v, rest / others) for v in estimate[2]))
+    if kind == "not_null":
+        return present
+    raise ValueError(f"unknown estimate {kind}")
+
+
+def index_pages(stats, columns, rows):
+    """Estimated leaf pages of a btree on columns."""
+    width = sum(stats.get(c, {}).get("avg_width", 8) for c in columns) + INDEX_ENTRY_OVERHEAD
+    return math.ceil(rows * width / (PAGE_BYTES * INDEX_FILL))
+
+
+def pages_via_index(pattern, stats, pages, rows, fraction):
+    """Pages a query reads through the candidate index: leaf pages, plus heap pages unless covering."""
+    read = index_pages(stats, pattern["columns"], rows) * fraction
+    if not pattern["covering"]:
+        correlation = abs(stats.get(pattern["columns"][0], {}).get("correlation") or 0)
+        # Rows in index order are clustered on disk when the column is correlated
+        # with the physical order; otherwise assume one heap page per row
+        read += pages * fraction if correlation > 0.5 else min(pages, rows * fraction)
+    return math.ceil(read)
+
+
+def matching_index(pattern, indexes):
+    """An existing index that serves the access path: same leading column (and all columns if covering)."""
+    for index in indexes:
+        if index["table"] != pattern["table"] or not index["key"]:
+            continue
+        if index["key"][0] != pattern["columns"][0]:
+            continue
+        if pattern["covering"] and not set(pattern["columns"]) <= set(index["columns"]):
+            continue
+        return index
+    return None
+
+
+def profile_seq_scans(profile, pattern):
+    """Sequential scans of the pattern's table in its stages, per the last --explain profile."""
+    if profile is None:
+        return None
+    return sum(
+        query["calls"]
+        for query in profile["queries"]
+        if query["stage"] in pattern["stages"]
+        and pattern["table"] in query.get("plan_summary", {}).get("seq_scans", [])
+    )
+
+
+def load_json(path):
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def advise(conn, cube_months=TREND_CUBE_MONTHS):
+    """Evaluate every access path and list unused indexes. Returns (paths, unused).
+
+    cube_months is the extraction's --cube-months.
+    """
+    tables = sorted({p["table"] for p in ACCESS_PATTERNS})
+    table_sizes = get_tables(conn, tables)
+    indexes = get_indexes(conn, tables)
+    column_stats = get_column_stats(conn, tables)
+
+    metadata = load_json(OUTPUT_DIR / "metadata.json") or {}
+    watermark = (metadata.get("watermark") or {}).get("max_job_id")
+    tools = load_json(OUTPUT_DIR / "tools.json") or {}
+    detail_chunks = math.ceil(tools.get("tool_count", DETAIL_CHUNK_TOOLS) / DETAIL_CHUNK_TOOLS)
+    profile = load_json(PROFILE_PATH)
+    if profile is not None and not profile.get("explain"):
+        profile = None
+
+    paths = []
+    for pattern in ACCESS_PATTERNS:
+        table = pattern["table"]
+        pages, rows = table_sizes.get(table, (1, -1))
+        stats = {column: s for (t, column), s in column_stats.items() if t == table}
+        calls = pattern["calls"] * (detail_chunks if pattern.get("per_detail_chunk") else 1)
+        path = {
+            "pattern": pattern,
+            "calls": calls,
+            "index": matching_index(pattern, indexes),
+            "table_pages": pages,
+            "profile_seq_scans": profile_seq_scans(profile, pattern),
+            "fraction": None,
+            "index_pages": None,
+        }
+        if rows >= 0 and stats:
+            path["fraction"] = read_fraction(
+                pattern["estimate"], stats, rows, watermark, max(TRENDS_MONTHS, cube_months)
+            )
+            if path["fraction"] is not None:
+                path["index_pages"] = pages_via_index(pattern, stats, pages, rows, path["fraction"])
+        paths.append(path)
+
+    used = {path["index"]["name"] for path in paths if path["index"]}
+    unused = [
+        index for index in indexes
+        if index["scans"] == 0 and not index["unique"] and index["name"] not in used
+    ]
+    return paths, unused
+
+
+def create_index_sql(pattern):
+    name = f"idx_{pattern['table']}_{'_'.join(pattern['columns'])}"
+    return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {pattern['table']} ({', '.join(pattern['columns'])});"
+
+
+def drop_index_sql(index):
+    """Commented out: uncommented by hand once the index is confirmed unused."""
+    return f"-- DROP INDEX CONCURRENTLY IF EXISTS {index['name']};"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Suggest indexes for the extract_data.py queries")
+    parser.add_argument("--db", default=DEFAULT_DB_URL, help="Database URL (default: $DATABASE_URL)")
+    parser.add_argument("--cube-months", type=int, default=TREND_CUBE_MONTHS,
+                        help=f"The extraction's --cube-months (default: {TREND_CUBE_MONTHS})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db_url = args.db
+    print(f"Connecting to {db_url.split('@')[-1] if '@' in db_url else db_url}...")
+
+    conn = psycopg2.connect(db_url)
+    try:
+        paths, unused = advise(conn, args.cube_months)
+        stats_reset = get_stats_reset(conn)
+    finally:
+        conn.close()
+
+    create, unknown = [], []
+    print("\nAccess paths:")
+    for path in paths:
+        pattern = path["pattern"]
+        label = f"{pattern['table']} ({', '.join(pattern['columns'])})"
+        print(f"\n  {label}")
+        print(f"    used by: {pattern['used_by']} ({path['calls']} per run)")
+        if path["profile_seq_scans"] is not None:
+            print(f"    last profile: {path['profile_seq_scans']} sequential scans of {pattern['table']} "
+                  f"in {', '.join(pattern['stages'])}")
+
+        if path["index"] is not None:
+            print(f"    ✓ served by {path['index']['name']}")
+            continue
+        if path["index_pages"] is None:
+            reason = "no watermark yet" if pattern["estimate"][0] == "after_watermark" else "no statistics; run ANALYZE"
+            print(f"    ? no index; can't estimate ({reason})")
+            unknown.append(pattern)
+            continue
+
+        pages = path["table_pages"]
+        saved = pages - path["index_pages"]
+        print(f"    reads ~{path['fraction']:.1%} of rows: ~{path['index_pages']:,} pages via an index "
+              f"vs {pages:,} for a sequential scan")
+        if path["index_pages"] <= pages * MAX_READ_SHARE:
+            print(f"    ✗ missing: avoids {path['calls']} sequential scans per run, "
+                  f"~{saved * path['calls']:,} pages")
+            create.append(pattern)
+        else:
+            print("    – no index: a sequential scan is about as cheap")
+
+    if stats_reset:
+        days = (datetime.now(stats_reset.tzinfo) - stats_reset).days
+        print(f"\nUnused since the last stats reset ({stats_reset:%Y-%m-%d}, {days} days ago):")
+    else:
+        print("\nUnused since the last stats reset (date unknown):")
+    if not unused:
+        print("  none")
+    for index in unused:
+        print(f"  {index['name']} on {index['table']}: 0 scans, {index['bytes'] / 1024 / 1024:.1f} MB")
+        print(f"    {index['definition']}")
+    if unused:
+        print("  Check these across a full extraction cycle and the tables' other readers before dropping any.")
+
+    if create or unused:
+        print("\n-- Suggested DDL")
+        for pattern in create:
+            print(create_index_sql(pattern))
+        if unused:
+            print("-- Unused indexes: uncomment once checked across a full extraction cycle")
+            for index in unused:
+                print(drop_index_sql(index))
+    if unknown:
+        print(f"\n{len(unknown)} access paths couldn't be estimated; see above.")
+
+
+if __name__ == "__main__":
+    main()
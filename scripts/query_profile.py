@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+query_profile.py — Per-query and per-stage profile of an extraction run.
+
+While a profile is active, connections opened with ProfilingCursor record,
+for every distinct query text within a stage:
+    calls, seconds   time spent in execute() and fetching (cache hits included)
+    rows, bytes      rows returned and their size in text form (roughly what
+                     the server sends with the text protocol)
+    plan             with explain, the EXPLAIN (ANALYZE, BUFFERS) plan of the
+                     first call, plus a summary of its cost, buffers and the
+                     tables it scans sequentially
+
+Stages are timed by wall clock; python_seconds is what's left of a stage
+after its queries, i.e. time spent post-processing rows and writing files.
+Queries and stages are sorted by name, so two profiles diff cleanly.
+
+Used by extract_data.py; not run directly.
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from time import perf_counter
+
+from psycopg2.extensions import cursor as _cursor
+
+from result_cache import CachingCursor
+
+_active = None
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def activate(explain=False):
+    """Start recording queries and stages."""
+    global _active
+    _active = {"explain": explain, "started": perf_counter(), "stages": {}, "queries": {}}
+
+
+def active():
+    return _active is not None
+
+
+@contextmanager
+def stage(name):
+    """Attribute the queries this thread runs to stage name, and time the stage."""
+    if _active is None:
+        yield
+        return
+    previous = getattr(_local, "stage", None)
+    _local.stage = name
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        _local.stage = previous
+        with _lock:
+            _active["stages"][name] = _active["stages"].get(name, 0.0) + perf_counter() - start
+
+
+def _entry(text):
+    """The stats of (current stage, query text), created on first use."""
+    key = (getattr(_local, "stage", None) or "other", text)
+    with _lock:
+        entry = _active["queries"].get(key)
+        if entry is None:
+            entry = _active["queries"][key] = {
+                "stage": key[0],
+                "query": text,
+                "calls": 0,
+                "cached_calls": 0,
+                "seconds": 0.0,
+                "explain_seconds": 0.0,
+                "rows": 0,
+                "bytes": 0,
+            }
+    return entry
+
+
+def _text_bytes(rows):
+    return sum(len(str(value).encode()) for row in rows for value in row if value is not None)
+
+
+def _plan_summary(plan):
+    """Cost, timing, buffers and sequentially scanned tables of an EXPLAIN (FORMAT JSON) plan."""
+    seq_scans = set()
+    nodes = [plan["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    root = plan["Plan"]
+    return {
+        "node": root["Node Type"],
+        "total_cost": root["Total Cost"],
+        "planning_ms": plan.get("Planning Time"),
+        "execution_ms": plan.get("Execution Time"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks"),
+        "shared_read_blocks": root.get("Shared Read Blocks"),
+        "temp_written_blocks": root.get("Temp Written Blocks"),
+        "seq_scans": sorted(seq_scans),
+    }
+
+
+class ProfilingCursor(CachingCursor):
+    """CachingCursor that records timings, rows and bytes in the active profile."""
+
+    _stats = None
+
+    def execute(self, query, vars=None):
+        text = " ".join((query.decode() if isinstance(query, bytes) else query).split())
+        plan = None
+        explain_seconds = 0.0
+        if _active["explain"] and text.upper().startswith(("SELECT", "WITH")):
+            start = perf_counter()
+            # A plain cursor on the same connection, so the plan sees the same snapshot
+            explain = _cursor(self.connection)
+            explain.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, vars)
+            plan = explain.fetchone()[0][0]
+            explain.close()
+            explain_seconds = perf_counter() - start
+
+        start = perf_counter()
+        result = super().execute(query, vars)
+        elapsed = perf_counter() - start
+
+        self._stats = None
+        if self.name or self.description is not None or self._hit is not None:
+            self._stats = stats = _entry(text)
+            with _lock:
+                stats["calls"] += 1
+                stats["cached_calls"] += self._hit is not None
+                stats["seconds"] += elapsed
+                stats["explain_seconds"] += explain_seconds
+                if plan is not None and "plan" not in stats:
+                    stats["plan_summary"] = _plan_summary(plan)
+                    stats["plan"] = plan
+        return result
+
+    def _fetched(self, rows, elapsed):
+        if self._stats is not None:
+            size = _text_bytes(rows)
+            with _lock:
+                self._stats["seconds"] += elapsed
+                self._stats["rows"] += len(rows)
+                self._stats["bytes"] += size
+
+    def fetchone(self):
+        start = perf_counter()
+        row = super().fetchone()
+        self._fetched([row] if row is not None else [], perf_counter() - start)
+        return row
+
+    def fetchmany(self, size=None):
+        start = perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(rows, perf_counter() - start)
+        return rows
+
+    def fetchall(self):
+        start = perf_counter()
+        rows = super().fetchall()
+        self._fetched(rows, perf_counter() - start)
+        return rows
+
+
+def build_profile(**extra):
+    """The recorded profile as a JSON-able dict, stages and queries sorted by name."""
+    queries = sorted(_active["queries"].values(), key=lambda q: (q["stage"], q["query"]))
+    stages = {}
+    for name in sorted(set(_active["stages"]) | {q["stage"] for q in queries}):
+        stage_queries = [q for q in queries if q["stage"] == name]
+        seconds = _active["stages"].get(name)
+        query_seconds = sum(q["seconds"] for q in stage_queries)
+        stages[name] = {
+            "seconds": round(seconds, 4) if seconds is not None else None,
+            "query_seconds": round(query_seconds, 4),
+            "python_seconds": (
+                round(seconds - query_seconds - sum(q["explain_seconds"] for q in stage_queries), 4)
+                if seconds is not None else None
+            ),
+            "queries": sum(q["calls"] for q in stage_queries),
+            "rows": sum(q["rows"] for q in stage_queries),
+            "bytes": sum(q["bytes"] for q in stage_queries),
+        }
+    for query in queries:
+        query["seconds"] = round(query["seconds"], 4)
+        query["explain_seconds"] = round(query["explain_seconds"], 4)
+    return {
+        "generated_at": datetime.now().isoformat(),
+        **extra,
+        "explain": _active["explain"],
+        "total_seconds": round(perf_counter() - _active["started"], 4),
+        "stages": stages,
+        "queries": queries,
+    }
+
+
+def write_profile(path, **extra):
+    """Write the profile to path. Returns the number of distinct queries."""
+    profile = build_profile(**extra)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2, default=str)
+    return len(profile["queries"])
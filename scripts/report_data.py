@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+report_data.py — Aggregates behind the report pages, computed once per extraction.
+
+reports.json holds every number the pages under src/pages/reports/ show, so
+the pages only render:
+    totals                jobs, companies, tools, and the share of tool
+                          mentions in remote-friendly postings
+    categories            site categories by job mentions, with their
+                          job-weighted salary range and top tool
+    most_in_demand        top tools by job count
+    category_breakdown    categories by salary midpoint, and their average range
+    enterprise_vs_smb     tools by market segment (from db_category), segment
+                          salaries, and enterprise/mid-market salary pairs
+    salary_report         salary percentiles per tool, function, seniority and
+                          company stage, with too-small groups left out; without
+                          salary sketches, tools' average ranges instead
+
+Tools appear as rows of {"slug", "name", "has_page", "category", "job_count",
+"unique_companies", "salary_min", "salary_max", "category_count"}, where
+category is the primary site category's {"slug", "name", "color"}.
+
+Everything is built in one pass over the extraction's tools plus the staged
+salaries.json and tool_details.json; nothing is queried. Rounding follows
+JavaScript's Math.round, as the pages did before.
+
+Used by extract_data.py; not run directly.
+"""
+
+import math
+from collections import defaultdict
+
+import tool_registry
+
+TOP_TOOLS = 20
+CROSS_MARKET_TOOLS = 15
+# "Tools with 10+ job mentions"
+WELL_COVERED_JOBS = 10
+# Salary groups with fewer postings are left out of the salary report
+MIN_SALARY_SAMPLE = 5
+# The category salary chart's axis ends at the highest range, rounded up to this
+SALARY_AXIS_STEP = 20000
+# Enterprise vs mid-market tools compared on salary, for the same job function
+SALARY_PAIRS = [
+    ("CRM", "salesforce", "hubspot"),
+    ("CRM (Tier 2)", "dynamics-365", "zoho-crm"),
+    ("Sales Engagement", "salesloft", "apollo"),
+]
+HEAD_TO_HEAD = ("salesforce", "hubspot")
+
+
+def js_round(value):
+    """Round half up, like Math.round."""
+    return math.floor(value + 0.5)
+
+
+def segment(db_category):
+    """Market segment of a db_category: enterprise, midmarket or cross_market."""
+    if db_category and "Enterprise" in db_category:
+        return "enterprise"
+    if db_category and ("MidMarket" in db_category or "Growth" in db_category):
+        return "midmarket"
+    return "cross_market"
+
+
+def tool_row(tool, categories, pages):
+    primary = tool.get("primary_category") or (tool.get("categories") or [None])[0]
+    category = categories.get(primary, {})
+    return {
+        "slug": tool["slug"],
+        "name": tool_registry.display_name(tool["slug"]),
+        "has_page": tool["slug"] in pages,
+        "category": {
+            "slug": primary,
+            "name": category.get("name", primary),
+            "color": category.get("color", "#14B8A6"),
+        },
+        "job_count": tool["job_count"],
+        "unique_companies": tool.get("unique_companies", 0),
+        "salary_min": tool.get("salary_min"),
+        "salary_max": tool.get("salary_max"),
+        "category_count": len(tool.get("categories") or []),
+    }
+
+
+def salary_midpoint(row):
+    if not (row["salary_min"] and row["salary_max"]):
+        return None
+    return js_round((row["salary_min"] + row["salary_max"]) / 2)
+
+
+def average_salary(rows):
+    """Unweighted average salary range of the rows with one: {"min", "max", "mid"}."""
+    rows = [row for row in rows if row["salary_min"] and row["salary_max"]]
+    if not rows:
+        return None
+    low = js_round(sum(row["salary_min"] for row in rows) / len(rows))
+    high = js_round(sum(row["salary_max"] for row in rows) / len(rows))
+    return {"min": low, "max": high, "mid": js_round((low + high) / 2)}
+
+
+def percent_change(value, base):
+    return js_round((value - base) / base * 100) if value and base else None
+
+
+def build_category_stats(categories, members):
+    """Per-category demand and job-weighted salary, most job mentions first.
+
+    members are each category's rows with postings, most jobs first.
+    """
+    stats = []
+    for category in categories:
+        rows = members[category["slug"]]
+        paid = [row for row in rows if row["salary_min"] and row["salary_max"]]
+        weight = sum(row["job_count"] for row in paid)
+        low = js_round(sum(row["salary_min"] * row["job_count"] for row in paid) / weight) if weight else None
+        high = js_round(sum(row["salary_max"] * row["job_count"] for row in paid) / weight) if weight else None
+        top = next((row for row in rows if not row["is_service"]), None)
+        stats.append({
+            "slug": category["slug"],
+            "name": category["name"],
+            "color": category["color"],
+            "tool_count": category["tool_count"],
+            "job_mentions": sum(tool["job_count"] for tool in category["tools"]),
+            "salary_min": low,
+            "salary_max": high,
+            "salary_mid": js_round((low + high) / 2) if low and high else None,
+            "tools_with_salary": len(paid),
+            "top_tool": {"slug": top["slug"], "name": top["name"]} if top else None,
+        })
+    stats.sort(key=lambda c: -c["job_mentions"])
+    return stats
+
+
+def salary_groups(groups):
+    """Groups with enough postings, highest median first, without their sketches."""
+    kept = [
+        {"key": key, **{k: v for k, v in group.items() if k not in ("sketch", "histogram")}}
+        for key, group in groups.items()
+        if group["jobs"] >= MIN_SALARY_SAMPLE and key.lower() != "unknown" and group.get("p50") is not None
+    ]
+    kept.sort(key=lambda g: -g["p50"])
+    return kept
+
+
+def build_average_salary_report(rows):
+    """Salary report from tools.json's average ranges, for data files without sketches.
+
+    Tools with MIN_SALARY_SAMPLE+ postings, highest midpoint first; no
+    function, seniority or stage groups.
+    """
+    tools = [
+        {
+            "slug": row["slug"], "name": row["name"], "has_page": row["has_page"],
+            "salary_min": row["salary_min"], "salary_max": row["salary_max"],
+            "midpoint": salary_midpoint(row), "jobs": row["job_count"],
+        }
+        for row in rows.values()
+        if row["salary_min"] and row["salary_max"] and row["job_count"] >= MIN_SALARY_SAMPLE
+    ]
+    tools.sort(key=lambda tool: -tool["midpoint"])
+    return {
+        "source": "averages",
+        "relative_accuracy": None,
+        "overall": None,
+        "tools": tools[:TOP_TOOLS],
+        "functions": [],
+        "seniority": [],
+        "company_stages": [],
+        "function_scale_max": 1,
+    }
+
+
+def build_salary_report(salaries, rows):
+    if not salaries.get("all"):
+        return build_average_salary_report(rows)
+    tools = [
+        {**group, "slug": group["key"], "name": rows[group["key"]]["name"], "has_page": rows[group["key"]]["has_page"]}
+        for group in salary_groups(salaries["tools"]) if group["key"] in rows
+    ]
+    functions = salary_groups(salaries["functions"])
+    return {
+        "source": "percentiles",
+        "relative_accuracy": salaries["relative_accuracy"],
+        "overall": {k: v for k, v in salaries["all"].items() if k not in ("sketch", "histogram")},
+        "tools": tools[:TOP_TOOLS],
+        "functions": functions,
+        "seniority": salary_groups(salaries["seniority"]),
+        "company_stages": salary_groups(salaries["company_stages"]),
+        # Bar chart scale: the highest p75 shown
+        "function_scale_max": max((g["p75"] for g in functions), default=1),
+    }
+
+
+def build_enterprise_vs_smb(rows):
+    # Services and tools without postings aren't products a segment adopts
+    ranked = [row for row in rows.values() if row["job_count"] > 0 and not row["is_service"]]
+    segments = defaultdict(list)
+    for row in ranked:
+        segments[segment(row["db_category"])].append(row)
+
+    report = {}
+    for name in ("enterprise", "midmarket", "cross_market"):
+        members = segments[name]
+        report[name] = {
+            "tool_count": len(members),
+            "job_mentions": sum(row["job_count"] for row in members),
+            "salary": average_salary(members),
+            "tools": members[:CROSS_MARKET_TOOLS] if name == "cross_market" else members,
+        }
+    enterprise, midmarket = report["enterprise"]["salary"], report["midmarket"]["salary"]
+    report["salary_gap_pct"] = percent_change(enterprise and enterprise["mid"], midmarket and midmarket["mid"]) or 0
+
+    # Most versatile cross-market tool: most site categories, earliest (most jobs) on ties
+    versatile = None
+    for row in segments["cross_market"]:
+        if versatile is None or row["category_count"] > versatile["category_count"]:
+            versatile = row
+    report["most_versatile"] = versatile
+
+    by_slug = {row["slug"]: row for row in ranked}
+    report["salary_pairs"] = []
+    for function, enterprise_slug, midmarket_slug in SALARY_PAIRS:
+        ent, mid = by_slug.get(enterprise_slug), by_slug.get(midmarket_slug)
+        if ent and mid and ent["salary_min"] and mid["salary_min"]:
+            report["salary_pairs"].append({
+                "function": function,
+                "enterprise": ent,
+                "midmarket": mid,
+                "gap_pct": percent_change(salary_midpoint(ent), salary_midpoint(mid)),
+            })
+
+    ent, mid = (by_slug.get(slug) for slug in HEAD_TO_HEAD)
+    report["head_to_head"] = {
+        "enterprise": ent,
+        "midmarket": mid,
+        "job_ratio": js_round(ent["job_count"] / mid["job_count"]),
+    } if ent and mid and mid["job_count"] else None
+    return report
+
+
+def build_reports(tools_list, categories, salaries, tool_details, pages, total_jobs, total_companies):
+    """The reports.json body.
+
+    tools_list is tools.json's tools (most jobs first), categories
+    categories.json's, salaries and tool_details the bodies of those files,
+    and pages the slugs with a tool page.
+    """
+    by_slug = {category["slug"]: category for category in categories}
+    rows, members = {}, defaultdict(list)
+    for tool in tools_list:
+        row = tool_row(tool, by_slug, pages)
+        # Kept for grouping, dropped before writing
+        row["is_service"] = tool.get("is_service", False)
+        row["db_category"] = tool.get("db_category")
+        rows[tool["slug"]] = row
+        if tool["job_count"] > 0:
+            for slug in tool.get("categories") or []:
+                members[slug].append(row)
+
+    remote = sum(d.get("remote_split", {}).get("remote", 0) for d in tool_details.values())
+    onsite = sum(d.get("remote_split", {}).get("onsite", 0) for d in tool_details.values())
+
+    category_stats = build_category_stats(categories, members)
+    with_salary = [c for c in category_stats if c["salary_min"] and c["salary_max"]]
+    by_salary = sorted(with_salary, key=lambda c: -c["salary_mid"])
+    demanded = [c for c in category_stats if c["job_mentions"] > 0]
+    ranked = [row for row in rows.values() if row["job_count"] > 0]
+
+    reports = {
+        "totals": {
+            "jobs": total_jobs,
+            "companies": total_companies,
+            "tools": len(tools_list),
+            "categories": len(categories),
+            # Weighted by tool mentions: a posting counts once per tool it mentions
+            "remote_share": round(remote / (remote + onsite), 4) if remote + onsite else None,
+        },
+        "categories": demanded,
+        "most_in_demand": {
+            "tools": ranked[:TOP_TOOLS],
+            "well_covered_tools": sum(1 for row in ranked if row["job_count"] >= WELL_COVERED_JOBS),
+        },
+        "category_breakdown": {
+            "by_salary": by_salary,
+            "average_salary_min": js_round(sum(c["salary_min"] for c in with_salary) / len(with_salary))
+            if with_salary else None,
+            "average_salary_max": js_round(sum(c["salary_max"] for c in with_salary) / len(with_salary))
+            if with_salary else None,
+            "salary_axis_max": math.ceil(max((c["salary_max"] for c in with_salary), default=0)
+                                         / SALARY_AXIS_STEP) * SALARY_AXIS_STEP or SALARY_AXIS_STEP,
+        },
+        "enterprise_vs_smb": build_enterprise_vs_smb(rows),
+        "salary_report": build_salary_report(salaries, rows),
+    }
+    for row in rows.values():
+        del row["is_service"], row["db_category"]
+    return reports
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+result_cache.py — Local cache of extraction query results.
+
+Results are keyed by the query text with its parameters bound (as sent to
+the server), under a directory named after a database fingerprint. When the
+fingerprint changes, the previous directory is dropped, so stale results are
+never served and the cache holds one generation at a time.
+
+Layout:
+    .extract_cache/queries/<fingerprint>/<query hash>.pickle
+
+Each file is a sequence of pickled row batches, written while the rows are
+consumed, so streaming (named) cursors stay streaming on both miss and hit.
+A result is only stored once it has been read to the end, and statements
+that return no rows are never stored.
+
+Only use CachingCursor on connections whose queries are deterministic for
+a given fingerprint (not for pg_export_snapshot() and the like).
+
+Used by extract_data.py; not run directly.
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+from itertools import islice
+from pathlib import Path
+
+from psycopg2.extensions import cursor as _cursor
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".extract_cache" / "queries"
+# Rows per batch when iterating a client-side cursor (named cursors use itersize)
+BATCH_ROWS = 10000
+
+_active = None
+
+
+def fingerprint_key(fingerprint):
+    """Stable short hash of a JSON-able fingerprint dict."""
+    text = repr(sorted(fingerprint.items()))
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def source_hash(paths):
+    """Hash of the given source files, so code changes invalidate cached outputs."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def activate(fingerprint, directory=CACHE_DIR):
+    """Serve and record query results for this fingerprint; drop other generations."""
+    global _active
+    key = fingerprint_key(fingerprint)
+    directory.mkdir(parents=True, exist_ok=True)
+    for old in directory.iterdir():
+        if old.name != key:
+            shutil.rmtree(old, ignore_errors=True)
+    _active = directory / key
+    _active.mkdir(exist_ok=True)
+    return _active
+
+
+def deactivate():
+    global _active
+    _active = None
+
+
+def _read_batches(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+class _Recorder:
+    """Writes row batches to a temp file; moved into place once the result is complete."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{id(self)}.tmp")
+        self.file = open(self.tmp_path, "wb")
+
+    def write(self, rows):
+        if rows:
+            pickle.dump(rows, self.file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        self.file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class CachingCursor(_cursor):
+    """psycopg2 cursor that serves repeated queries from the active cache.
+
+    Covers fetchone(), fetchmany(), fetchall() and iteration, including
+    named (server-side) cursors, which are recorded one fetch at a time.
+    """
+
+    _hit = None
+    _recorder = None
+
+    def execute(self, query, vars=None):
+        self._finish(complete=False)
+        self._hit = path = None
+        if _active is not None:
+            path = _active / (hashlib.sha256(self.mogrify(query, vars)).hexdigest() + ".pickle")
+            if path.exists():
+                self._hit = _read_batches(path)
+                return None
+        result = super().execute(query, vars)
+        # Only statements returning rows are recorded; SET and friends always run
+        if path is not None and (self.name or self.description is not None):
+            self._recorder = _Recorder(path)
+        return result
+
+    def _record(self, rows, complete):
+        if self._recorder is not None:
+            self._recorder.write(rows)
+            if complete:
+                self._finish(complete=True)
+
+    def _finish(self, complete):
+        if self._recorder is not None:
+            if complete:
+                self._recorder.commit()
+            else:
+                self._recorder.discard()
+            self._recorder = None
+
+    def fetchone(self):
+        if self._hit is not None:
+            return next(self._hit, None)
+        row = super().fetchone()
+        done = row is None or (not self.name and self.rownumber >= self.rowcount)
+        self._record([row] if row is not None else [], done)
+        return row
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        if self._hit is not None:
+            return list(islice(self._hit, size))
+        rows = super().fetchmany(size)
+        done = not rows or (not self.name and self.rownumber >= self.rowcount)
+        self._record(rows, done)
+        return rows
+
+    def fetchall(self):
+        if self._hit is not None:
+            return list(self._hit)
+        rows = super().fetchall()
+        self._record(rows, True)
+        return rows
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(self.itersize if self.name else BATCH_ROWS)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._finish(complete=False)
+        super().close()
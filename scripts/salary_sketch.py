@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+salary_sketch.py — Mergeable salary quantile sketches.
+
+A sketch is a log-bucketed histogram: a salary x lands in bucket
+ceil(log(x) / log(GAMMA)), and every bucket spans a fixed ratio GAMMA, so
+any quantile read back from the bucket counts is within RELATIVE_ACCURACY of
+the exact value. Sketches merge by adding bucket counts; the result is the
+sketch of the combined postings, which lets incremental runs add new jobs to
+the previous run's sketches instead of rescanning all jobs.
+
+Each posting contributes one value, the midpoint of its salary bounds above
+MIN_ANNUAL_SALARY (or the one bound that is). Sketches are kept per group of
+four dimensions, built from one stream of salary rows ordered by job:
+    tools            site tool slug
+    functions        function_category
+    seniority        seniority_tier
+    company_stages   company_stage
+plus "all" for every posting that mentions a site tool.
+
+Serialized, a sketch is {"offset": first bucket, "counts": dense counts}.
+
+Used by extract_data.py; not run directly.
+"""
+
+import math
+from collections import Counter, defaultdict
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+
+# Salaries at or below this are treated as hourly/noise, as in extract_tools()
+MIN_ANNUAL_SALARY = 30000
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# $25K bins from $25K; the last bin is open-ended
+HISTOGRAM_WIDTH = 25000
+HISTOGRAM_BINS = 12
+
+DIMENSIONS = ("tools", "functions", "seniority", "company_stages")
+
+
+def _bucket(value):
+    return math.ceil(math.log(value) / _LOG_GAMMA)
+
+
+def _bucket_value(index):
+    """Representative salary of a bucket: equidistant (relatively) from its bounds."""
+    return 2 * GAMMA ** index / (GAMMA + 1)
+
+
+def posting_salary(salary_min, salary_max):
+    """The value a posting adds to its sketches, or None when it reports no usable salary."""
+    bounds = [v for v in (salary_min, salary_max) if v is not None and v > MIN_ANNUAL_SALARY]
+    return sum(bounds) / len(bounds) if bounds else None
+
+
+def merge(sketch, other):
+    """Add other's bucket counts into sketch."""
+    sketch.update(other)
+    return sketch
+
+
+def quantile(sketch, q):
+    """Salary at quantile q (0-1), or None for an empty sketch."""
+    total = sum(sketch.values())
+    if not total:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for index in sorted(sketch):
+        seen += sketch[index]
+        if seen > rank:
+            return _bucket_value(index)
+    return _bucket_value(max(sketch))
+
+
+def histogram(sketch):
+    """Posting counts per HISTOGRAM_WIDTH bin, starting at one bin width."""
+    counts = [0] * HISTOGRAM_BINS
+    for index, count in sketch.items():
+        bin_ = int(_bucket_value(index) // HISTOGRAM_WIDTH) - 1
+        counts[min(max(bin_, 0), HISTOGRAM_BINS - 1)] += count
+    return counts
+
+
+def histogram_bins():
+    """[low, high] bounds of the histogram bins; the last high is None."""
+    return [
+        [(i + 1) * HISTOGRAM_WIDTH, (i + 2) * HISTOGRAM_WIDTH if i < HISTOGRAM_BINS - 1 else None]
+        for i in range(HISTOGRAM_BINS)
+    ]
+
+
+def encode(sketch):
+    if not sketch:
+        return {"offset": 0, "counts": []}
+    offset = min(sketch)
+    return {"offset": offset, "counts": [sketch.get(i, 0) for i in range(offset, max(sketch) + 1)]}
+
+
+def decode(data):
+    return Counter({data["offset"] + i: count for i, count in enumerate(data["counts"]) if count})
+
+
+def sketch_salaries(rows, tool_slug):
+    """Build {"all": sketch, dimension: {value: sketch}} in one pass over salary rows.
+
+    rows are (job_id, tool_name, db_category, company_stage, seniority_tier,
+    function_category, salary_min, salary_max), grouped by job. tool_slug maps
+    (tool_name, db_category) to a site tool slug, or None for tools the site
+    doesn't track. A job counts once per group, however many of its rows match.
+    """
+    sketches = {"all": Counter(), **{dimension: defaultdict(Counter) for dimension in DIMENSIONS}}
+    current, bucket, slugs = None, None, set()
+    for job_id, tool_name, db_category, stage, seniority, function, salary_min, salary_max in rows:
+        if job_id != current:
+            current, slugs = job_id, set()
+            salary = posting_salary(salary_min, salary_max)
+            bucket = _bucket(salary) if salary is not None else None
+            if bucket is not None:
+                sketches["all"][bucket] += 1
+                for dimension, value in (("functions", function), ("seniority", seniority),
+                                         ("company_stages", stage)):
+                    if value is not None:
+                        sketches[dimension][value][bucket] += 1
+        if bucket is None:
+            continue
+        slug = tool_slug(tool_name, db_category)
+        if slug is not None and slug not in slugs:
+            slugs.add(slug)
+            sketches["tools"][slug][bucket] += 1
+    return sketches
+
+
+def merge_sketches(previous, delta):
+    """Merge two sketch sets from sketch_salaries()."""
+    merged = {"all": merge(Counter(previous["all"]), delta["all"])}
+    for dimension in DIMENSIONS:
+        merged[dimension] = defaultdict(Counter)
+        for source in (previous[dimension], delta[dimension]):
+            for value, sketch in source.items():
+                merge(merged[dimension][value], sketch)
+    return merged
+
+
+def summarize(sketch):
+    """Postings, percentiles (rounded to $100), histogram and the serialized sketch."""
+    summary = {"jobs": sum(sketch.values())}
+    for p in PERCENTILES:
+        value = quantile(sketch, p / 100)
+        summary[f"p{p}"] = int(round(value, -2)) if value is not None else None
+    summary["histogram"] = histogram(sketch)
+    summary["sketch"] = encode(sketch)
+    return summary
+
+
+def build_salaries(sketches):
+    """The salaries.json body: summaries per group, each dimension sorted by postings."""
+    salaries = {
+        "relative_accuracy": RELATIVE_ACCURACY,
+        "min_annual_salary": MIN_ANNUAL_SALARY,
+        "histogram_bins": histogram_bins(),
+        "all": summarize(sketches["all"]),
+    }
+    for dimension in DIMENSIONS:
+        groups = sorted(sketches[dimension].items(), key=lambda item: (-sum(item[1].values()), item[0]))
+        salaries[dimension] = {value: summarize(sketch) for value, sketch in groups}
+    return salaries
+
+
+def load_sketches(salaries):
+    """Sketch set from a previous salaries.json, for merge_sketches()."""
+    sketches = {"all": decode(salaries["all"]["sketch"])}
+    for dimension in DIMENSIONS:
+        sketches[dimension] = {value: decode(group["sketch"]) for value, group in salaries[dimension].items()}
+    return sketches
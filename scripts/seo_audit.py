@@ -260,7 +260,7 @@ class SEOHTMLParser(HTMLParser):
 # Issue collector
 # ---------------------------------------------------------------------------
 class PageAudit:
-    """Collects issues for a single page."""
+    """Collects issues for a single page, and the parsed facts cross-page checks need."""
 
     def __init__(self, filepath: str, url_path: str):
         self.filepath = filepath
@@ -268,6 +268,9 @@ class PageAudit:
         self.issues = []  # list of (severity, category, message)
         # Diagnostic stats (not counted as issues)
         self.stats = {}  # key -> value for reporting
+        # Parsed once in audit_page(), for check_uniqueness()
+        self.title = None
+        self.meta_description = None
 
     def add(self, severity: str, category: str, message: str):
         self.issues.append((severity, category, message))
@@ -343,6 +346,8 @@ def audit_page(filepath: str, url_path: str) -> PageAudit:
     except Exception as e:
         audit.add(CRITICAL, "Parse Error", f"Failed to parse HTML: {e}")
         return audit
+    audit.title = parser.title
+    audit.meta_description = parser.meta_description
 
     # --- 1. Title Tag ---
     if parser.title is None or parser.title == "":
@@ -524,23 +529,29 @@ def _is_decorative(img: dict) -> bool:
 # ---------------------------------------------------------------------------
 # Uniqueness checks across all pages
 # ---------------------------------------------------------------------------
-def check_uniqueness(audits: list[PageAudit], all_titles: dict, all_descriptions: dict):
+def check_uniqueness(audits: list[PageAudit]):
     """Check that titles and meta descriptions are unique across all pages."""
+    all_titles = defaultdict(list)
+    all_descriptions = defaultdict(list)
+    for audit in audits:
+        if audit.title:
+            all_titles[audit.title].append(audit)
+        if audit.meta_description:
+            all_descriptions[audit.meta_description].append(audit)
+
     # Titles
-    for title_text, pages in all_titles.items():
-        if len(pages) > 1 and title_text:
-            for audit in audits:
-                if audit.url_path in pages:
-                    other_pages = [p for p in pages if p != audit.url_path]
-                    audit.add(WARNING, "Title", f"Duplicate title shared with: {other_pages[:3]}")
+    for shared in all_titles.values():
+        if len(shared) > 1:
+            for audit in shared:
+                other_pages = [a.url_path for a in shared if a is not audit]
+                audit.add(WARNING, "Title", f"Duplicate title shared with: {other_pages[:3]}")
 
     # Descriptions
-    for desc_text, pages in all_descriptions.items():
-        if len(pages) > 1 and desc_text:
-            for audit in audits:
-                if audit.url_path in pages:
-                    other_pages = [p for p in pages if p != audit.url_path]
-                    audit.add(WARNING, "Meta Description", f"Duplicate description shared with: {other_pages[:3]}")
+    for shared in all_descriptions.values():
+        if len(shared) > 1:
+            for audit in shared:
+                other_pages = [a.url_path for a in shared if a is not audit]
+                audit.add(WARNING, "Meta Description", f"Duplicate description shared with: {other_pages[:3]}")
 
 
 # ---------------------------------------------------------------------------
@@ -809,33 +820,20 @@ def main():
     print(f"Found {len(pages)} pages to audit.")
     print()
 
-    # Phase 1: Audit each page
+    # Phase 1: Audit each page (one read and one parse per page)
     audits = []
-    all_titles = defaultdict(list)
-    all_descriptions = defaultdict(list)
-
     for i, (filepath, url_path) in enumerate(pages):
         if (i + 1) % 50 == 0 or i == 0:
             print(f"  Auditing page {i+1}/{len(pages)}: {url_path}")
 
-        audit = audit_page(filepath, url_path)
-        audits.append(audit)
-
-        # Collect titles and descriptions for uniqueness check
-        parser = SEOHTMLParser()
-        with open(filepath, "r", encoding="utf-8") as f:
-            parser.feed(f.read())
-        if parser.title:
-            all_titles[parser.title].append(url_path)
-        if parser.meta_description:
-            all_descriptions[parser.meta_description].append(url_path)
+        audits.append(audit_page(filepath, url_path))
 
     print(f"  Auditing page {len(pages)}/{len(pages)}: done.")
     print()
 
     # Phase 2: Cross-page uniqueness checks
     print("Running cross-page uniqueness checks...")
-    check_uniqueness(audits, all_titles, all_descriptions)
+    check_uniqueness(audits)
 
     # Phase 3: Generate report
     print("Generating report...")
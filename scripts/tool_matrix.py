@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+tool_matrix.py — Job×tool incidence and tool co-occurrence.
+
+The incidence matrix A has one row per job and one column per tool, with a 1
+where the job mentions the tool. Jobs arrive as (job_key, tool_name) rows
+grouped by job, from a server-side cursor or the local snapshot.
+
+Every pair count comes from one product, AᵀA, accumulated job by job as the
+rows stream past: each tool's job count (the diagonal) and a sparse Counter
+keyed by (a, b) tool columns, a < b, for the jobs mentioning both. Only pairs
+that occur are held, so memory grows with the distinct pairs seen, not with
+the number of jobs or the square of the number of tools.
+
+Larger stacks are mined with FP-growth: job rows are folded into a prefix
+tree (FP-tree) of their frequent tools, most frequent first, and frequent
+itemsets are grown from conditional trees. Jobs sharing a prefix share tree
+nodes, and tools below the support floor never enter a tree, so a tree is
+bounded by the distinct frequent prefixes. Both of FP-growth's passes
+stream: item supports are the diagonal of the pair-counting pass, and the
+second pass reads the rows again, folding each job into the tree as it
+arrives. No job×tool matrix is held, so memory doesn't grow with the jobs
+table beyond the tree.
+
+Used by extract_data.py; not run directly.
+"""
+
+import math
+from array import array
+from collections import Counter, defaultdict
+from itertools import combinations
+
+
+def group_jobs(rows):
+    """Yield each job's set of tool names from (job_key, tool_name) rows grouped by job.
+
+    Repeated (job, tool) rows collapse, so counts are distinct jobs.
+    """
+    current, tools = None, set()
+    for job, tool in rows:
+        if job != current:
+            if tools:
+                yield tools
+            current, tools = job, set()
+        tools.add(tool)
+    if tools:
+        yield tools
+
+
+def count_pairs(rows):
+    """Accumulate AᵀA sparsely from (job_key, tool_name) rows grouped by job.
+
+    Returns {"tools": column -> tool name, "jobs": jobs mentioning any tool,
+    "tool_jobs": {column: jobs}, "pairs": {(a, b): jobs mentioning both}},
+    with a < b. Only one job's tools are held at a time.
+    """
+    columns = {}
+    tool_jobs, pairs = Counter(), Counter()
+    jobs = 0
+    for names in group_jobs(rows):
+        row = sorted(columns.setdefault(name, len(columns)) for name in names)
+        jobs += 1
+        tool_jobs.update(row)
+        pairs.update(combinations(row, 2))
+    return {"tools": list(columns), "jobs": jobs, "tool_jobs": tool_jobs, "pairs": pairs}
+
+
+def association_scores(count, jobs_a, jobs_b, total_jobs):
+    """Lift, pointwise mutual information (bits) and Jaccard index of a pair.
+
+    count is the number of jobs mentioning both tools, jobs_a / jobs_b the jobs
+    mentioning each, total_jobs the jobs mentioning any tool.
+    """
+    lift = count * total_jobs / (jobs_a * jobs_b)
+    return {
+        "lift": round(lift, 3),
+        "pmi": round(math.log2(lift), 3),
+        "jaccard": round(count / (jobs_a + jobs_b - count), 4),
+    }
+
+
+def _build_fp_tree(paths, support):
+    """Fold weighted (items, count) paths into an FP-tree.
+
+    Items must already be in tree order (descending global frequency); items
+    missing from support are skipped. Nodes live in parallel arrays, node 0
+    being the root; nodes[item] lists the nodes holding item.
+    """
+    tree = {
+        "parent": array("i", [-1]),
+        "item": array("i", [-1]),
+        "count": array("q", [0]),
+        "nodes": defaultdict(list),
+        "support": support,
+    }
+    parent, item_of, count, nodes = tree["parent"], tree["item"], tree["count"], tree["nodes"]
+    children = {}
+    for items, weight in paths:
+        node = 0
+        for item in items:
+            if item not in support:
+                continue
+            child = children.get((node, item))
+            if child is None:
+                child = len(parent)
+                children[(node, item)] = child
+                parent.append(node)
+                item_of.append(item)
+                count.append(0)
+                nodes[item].append(child)
+            count[child] += weight
+            node = child
+    return tree
+
+
+def _mine_fp_tree(tree, suffix, min_jobs, max_size, found):
+    """Record every frequent itemset ending in suffix, growing it from tree."""
+    parent, item_of, count = tree["parent"], tree["item"], tree["count"]
+    for item, jobs in tree["support"].items():
+        stack = suffix + (item,)
+        found[tuple(sorted(stack))] = jobs
+        if len(stack) == max_size:
+            continue
+
+        # Conditional pattern base: the prefix path above every node of item
+        base = []
+        conditional = Counter()
+        for node in tree["nodes"][item]:
+            path = []
+            p = parent[node]
+            while p > 0:
+                path.append(item_of[p])
+                p = parent[p]
+            if path:
+                path.reverse()
+                base.append((path, count[node]))
+                for prefix_item in path:
+                    conditional[prefix_item] += count[node]
+        support = {i: n for i, n in conditional.items() if n >= min_jobs}
+        if support:
+            _mine_fp_tree(_build_fp_tree(base, support), stack, min_jobs, max_size, found)
+
+
+def frequent_stacks(jobs, tools, item_jobs, min_jobs, max_size):
+    """Mine every tool set of up to max_size tools mentioned together in min_jobs jobs.
+
+    item_jobs are the first pass's job counts per tool column ("tool_jobs"
+    of count_pairs(), tools its column names); jobs yields each job's set of
+    tool names for the second pass (group_jobs() over a fresh row stream).
+    Returns {tuple of sorted tool columns: jobs}; all subsets of a frequent
+    set are frequent too, so they're always present for confidence lookups.
+    """
+    support = {item: count for item, count in item_jobs.items() if count >= min_jobs}
+    # Tool name -> (tree order, column)
+    rank = {tools[item]: (r, item) for r, item in enumerate(sorted(support, key=lambda i: (-support[i], i)))}
+
+    def transactions():
+        for names in jobs:
+            items = sorted(rank[name] for name in names if name in rank)
+            if items:
+                yield [item for _, item in items], 1
+
+    found = {}
+    _mine_fp_tree(_build_fp_tree(transactions(), support), (), min_jobs, max_size, found)
+    return found
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+tool_registry.py — Canonical tool identities: slug, display name and aliases.
+
+data/tool_registry.json maps every spelling of a tool the scripts have met
+(raw job_tools names, display names from tool_content.json, hand-added
+aliases) to one canonical slug:
+    tools   {slug: {"name": display name, "aliases": [names]}}, sorted by slug
+
+Aliases match case- and whitespace-insensitively. A name that isn't an
+alias yet gets slugify()'s slug and is added as an alias of it, so it
+resolves with one dict lookup from then on. Add an alias by hand to fold a
+spelling into another tool ("Hunter.io" under hunter-io, say).
+
+Collisions are reported rather than resolved silently:
+    - one alias listed under two slugs makes the registry invalid (ValueError)
+    - a new name whose slug already belongs to differently named tools is
+      merged into it and reported, so a wrong merge can be split by hand
+    - a display name that is already another tool's alias is reported and
+      not added as an alias; so are display names shared by two tools
+
+The registry is loaded once per process; slug() and display_name() are
+dict lookups. extract_data.py records the names it met and saves it.
+display_name() reads tool_content.json's display names first, as update()
+applies them, so a tool added there shows its curated name before the next
+extraction registers it.
+
+Used by extract_data.py and the generator scripts; not run directly.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import data_files
+
+REGISTRY_PATH = Path(__file__).resolve().parent.parent / "data" / "tool_registry.json"
+CONTENT_PATH = REGISTRY_PATH.with_name("tool_content.json")
+
+# Applied in order after lowercasing
+SLUG_REPLACEMENTS = [
+    (".", ""),
+    ("(", ""),
+    (")", ""),
+    ("'", ""),
+    (",", ""),
+    ("&", "and"),
+    ("/", "-"),
+    (" ", "-"),
+    ("--", "-"),
+]
+
+_registry = None
+_curated_names = None
+# Names may first be met on several extraction threads at once
+_lock = threading.Lock()
+
+
+def slugify(name):
+    """Convert tool name to URL slug."""
+    slug = name.lower()
+    for old, new in SLUG_REPLACEMENTS:
+        slug = slug.replace(old, new)
+    return slug.strip("-")
+
+
+def alias_key(name):
+    """The form aliases are matched in: casefolded, whitespace collapsed."""
+    return " ".join(name.casefold().split())
+
+
+def index(tools):
+    """The registry state for {slug: {"name", "aliases"}}.
+
+    Raises ValueError when an alias is listed under two slugs.
+    """
+    slugs = {}
+    for slug, tool in tools.items():
+        for alias in tool["aliases"]:
+            claimed = slugs.setdefault(alias_key(alias), slug)
+            if claimed != slug:
+                raise ValueError(f"tool registry: alias {alias!r} is listed under both {claimed!r} and {slug!r}")
+    return {
+        "tools": {slug: {"name": tool["name"], "aliases": set(tool["aliases"])} for slug, tool in tools.items()},
+        # alias key → slug, and exact names already resolved → slug
+        "slugs": slugs,
+        "resolved": {},
+        "collisions": [],
+    }
+
+
+def load(path=REGISTRY_PATH):
+    """Load the registry (once per process; an absent file is an empty registry)."""
+    global _registry
+    if _registry is not None:
+        return
+    tools = {}
+    if Path(path).exists():
+        with open(path) as f:
+            tools = json.load(f)["tools"]
+    _registry = index(tools)
+
+
+def slug(name):
+    """Canonical slug of a tool name, registering names not seen before."""
+    found = _registry["resolved"].get(name) if _registry is not None else None
+    if found is not None:
+        return found
+    load()
+    key = alias_key(name)
+    with _lock:
+        found = _registry["slugs"].get(key)
+        if found is None:
+            found = slugify(name)
+            tool = _registry["tools"].setdefault(found, {"name": name, "aliases": set()})
+            if tool["aliases"]:
+                _registry["collisions"].append(
+                    f"{name!r} merged into {found!r}, also named {', '.join(map(repr, sorted(tool['aliases'])))}"
+                )
+            tool["aliases"].add(name)
+            _registry["slugs"][key] = found
+        _registry["resolved"][name] = found
+    return found
+
+
+def curated_names(path=CONTENT_PATH):
+    """{slug: display name} from tool_content.json (once per process; {} without the file)."""
+    global _curated_names
+    if _curated_names is None:
+        _curated_names = {}
+        if Path(path).exists():
+            with open(path) as f:
+                _curated_names = {
+                    slug: content["display_name"]
+                    for slug, content in json.load(f).items() if content.get("display_name")
+                }
+    return _curated_names
+
+
+def display_name(slug):
+    """Display name of a slug: tool_content.json's, then the registry's; other slugs are title-cased."""
+    curated = curated_names().get(slug)
+    if curated:
+        return curated
+    load()
+    tool = _registry["tools"].get(slug)
+    return tool["name"] if tool else " ".join(w.capitalize() for w in slug.split("-"))
+
+
+def update(tools, display_names):
+    """Register each tool's name under its slug and apply display names.
+
+    tools are tools.json entries; display_names maps slugs to names curated
+    elsewhere (tool_content.json), which win over database names and are
+    added as aliases.
+    """
+    load()
+    for tool in tools:
+        entry = _registry["tools"].setdefault(tool["slug"], {"name": tool["name"], "aliases": set()})
+        _add_alias(tool["slug"], entry, tool["name"])
+
+    for slug, name in display_names.items():
+        if not name:
+            continue
+        entry = _registry["tools"].setdefault(slug, {"name": name, "aliases": set()})
+        entry["name"] = name
+        _add_alias(slug, entry, name)
+
+    by_name = {}
+    for slug, tool in sorted(_registry["tools"].items()):
+        other = by_name.setdefault(alias_key(tool["name"]), slug)
+        if other != slug:
+            _registry["collisions"].append(f"{other!r} and {slug!r} are both displayed as {tool['name']!r}")
+
+
+def _add_alias(slug, entry, name):
+    claimed = _registry["slugs"].setdefault(alias_key(name), slug)
+    if claimed != slug:
+        _registry["collisions"].append(f"{name!r} names {slug!r} but is already an alias of {claimed!r}")
+    elif not any(alias_key(alias) == alias_key(name) for alias in entry["aliases"]):
+        entry["aliases"].add(name)
+
+
+def collisions():
+    """Collisions met since the registry was loaded, as messages."""
+    load()
+    return list(_registry["collisions"])
+
+
+def save(path=REGISTRY_PATH):
+    """Write the registry if its content changed. Returns True when it was written."""
+    load()
+    return data_files.write_if_changed(Path(path), {
+        "generated_at": datetime.now().isoformat(),
+        "tools": {
+            slug: {"name": tool["name"], "aliases": sorted(tool["aliases"])}
+            for slug, tool in sorted(_registry["tools"].items())
+        },
+    })